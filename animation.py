@@ -0,0 +1,133 @@
+"""One timer for every UI animation, with a frame budget.
+
+Each effect used to run its own ``root.after`` chain at its own interval, so
+a results screen had hundreds of timers competing for the Tk thread.
+``AnimationScheduler`` runs a single ``after`` tick while any animation is
+active and calls each animation's step function when it is due. A step gets
+the current ``time.perf_counter()`` and returns False when the animation is
+finished; a step whose widget has been destroyed (``TclError``) is dropped.
+
+The time spent in each tick is measured. When the smoothed cost stays above
+the frame budget (a share of the frame interval) the scheduler steps down a
+quality level, which lowers the frame rate and the share of particles
+effects may use (``particle_scale``); once frames are cheap again for a few
+seconds it steps back up.
+"""
+import time
+from tkinter import TclError
+
+# (frames per second, share of the particle budget) from best to cheapest
+QUALITY_LEVELS = (
+    (30, 1.0),
+    (20, 0.5),
+    (12, 0.25),
+)
+FRAME_BUDGET = 0.5
+DOWNGRADE_FRAMES = 5
+UPGRADE_SECONDS = 3.0
+COST_SMOOTHING = 0.3
+
+
+class AnimationScheduler:
+    """Ticks all active animations of ``root`` from one ``after`` timer."""
+
+    def __init__(self, root, levels=QUALITY_LEVELS, frame_budget=FRAME_BUDGET):
+        self.root = root
+        self.levels = levels
+        self.frame_budget = frame_budget
+        self.level = 0
+        self.animations = {}
+        self.frame_cost = 0.0
+        self.frames = 0
+        self.downgrades = 0
+        self._over_budget = 0
+        self._cheap_since = None
+        self._after_id = None
+
+    @property
+    def fps(self):
+        return self.levels[self.level][0]
+
+    @property
+    def particle_scale(self):
+        return self.levels[self.level][1]
+
+    @property
+    def frame_interval(self):
+        return 1.0 / self.fps
+
+    @property
+    def budget(self):
+        """Seconds a tick may take at the current frame rate."""
+        return self.frame_interval * self.frame_budget
+
+    def add(self, key, step, interval=0.0):
+        """Run ``step(now)`` every ``interval`` seconds (or every frame) until it returns False.
+
+        Adding under a key that is already running replaces that animation.
+        The first step runs on the next tick.
+        """
+        self.animations[key] = [step, interval, 0.0]
+        self._schedule()
+
+    def remove(self, key):
+        self.animations.pop(key, None)
+
+    def is_running(self, key):
+        return key in self.animations
+
+    def stop(self):
+        """Drop every animation and cancel the timer."""
+        self.animations.clear()
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except TclError:
+                pass
+            self._after_id = None
+
+    def _schedule(self):
+        if self._after_id is None and self.animations:
+            self._after_id = self.root.after(int(self.frame_interval * 1000), self._tick)
+
+    def _tick(self):
+        self._after_id = None
+        started = time.perf_counter()
+        for key, entry in list(self.animations.items()):
+            step, interval, due = entry
+            if started < due or self.animations.get(key) is not entry:
+                continue
+            try:
+                keep = step(started)
+            except TclError:
+                keep = False
+            if keep is False:
+                if self.animations.get(key) is entry:
+                    del self.animations[key]
+            else:
+                entry[2] = started + interval
+        self.record_frame(time.perf_counter() - started, started)
+        self._schedule()
+
+    def record_frame(self, cost, now):
+        """Account one tick's cost and change quality level if the budget calls for it."""
+        self.frames += 1
+        self.frame_cost += COST_SMOOTHING * (cost - self.frame_cost)
+        if self.frame_cost > self.budget:
+            self._cheap_since = None
+            self._over_budget += 1
+            if self._over_budget >= DOWNGRADE_FRAMES and self.level < len(self.levels) - 1:
+                self.level += 1
+                self.downgrades += 1
+                self._over_budget = 0
+            return
+        self._over_budget = 0
+        # Only step up when the better level's budget would have been met comfortably
+        if self.level > 0 and self.frame_cost < self.budget * self.fps / self.levels[self.level - 1][0] / 2:
+            if self._cheap_since is None:
+                self._cheap_since = now
+            elif now - self._cheap_since >= UPGRADE_SECONDS:
+                self.level -= 1
+                self._cheap_since = None
+        else:
+            self._cheap_since = None
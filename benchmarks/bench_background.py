@@ -0,0 +1,72 @@
+"""Cost of the gradient background on each screen change.
+
+Compares the old per-row ImageDraw loop plus a new PhotoImage on every
+screen with render_gradient and the cached PhotoImage that
+create_gradient_background now reuses. Needs a display for the PhotoImage
+part; without one only image generation is timed.
+
+Usage: python benchmarks/bench_background.py [WIDTHxHEIGHT ...]
+"""
+import os
+import sys
+import time
+import tkinter as tk
+
+from PIL import Image, ImageDraw, ImageTk
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from quiz import render_gradient  # noqa: E402
+
+SIZES = ("1366x768", "1920x1080", "3840x2160")
+
+
+def old_gradient(width, height):
+    """The per-row loop create_gradient_background used to run."""
+    gradient = Image.new('RGB', (width, height), '#1a1a2e')
+    draw = ImageDraw.Draw(gradient)
+    for i in range(height):
+        r = int(26 + (128 - 26) * (i / height))
+        g = int(26 + (0 - 26) * (i / height))
+        b = int(46 + (128 - 46) * (i / height))
+        draw.rectangle([(0, i), (width, i+1)], fill=(r, g, b))
+    return gradient
+
+
+def best_ms(function, repeat=5):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1000
+
+
+def main():
+    sizes = [tuple(int(part) for part in size.lower().split("x")) for size in (sys.argv[1:] or SIZES)]
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        root = None
+        print(f"no display ({e}); timing image generation only")
+
+    print(f"{'size':<12}{'old draw ms':>12}{'numpy ms':>12}{'old screen ms':>15}{'cached ms':>11}")
+    for width, height in sizes:
+        if old_gradient(width, height).tobytes() != render_gradient.__wrapped__(width, height).tobytes():
+            raise SystemExit(f"gradients differ at {width}x{height}")
+        old_ms = best_ms(lambda: old_gradient(width, height))
+        new_ms = best_ms(lambda: render_gradient.__wrapped__(width, height))
+        line = f"{f'{width}x{height}':<12}{old_ms:>12.1f}{new_ms:>12.1f}"
+        if root is not None:
+            screen_ms = best_ms(lambda: ImageTk.PhotoImage(old_gradient(width, height)))
+            render_gradient(width, height)
+            # A later screen only looks the image up; the PhotoImage is kept
+            cached_ms = best_ms(lambda: render_gradient(width, height))
+            line += f"{screen_ms:>15.1f}{cached_ms:>11.3f}"
+        print(line)
+    if root is not None:
+        root.destroy()
+
+
+if __name__ == "__main__":
+    main()
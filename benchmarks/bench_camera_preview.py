@@ -0,0 +1,100 @@
+"""Tk-thread cost of showing one camera preview frame.
+
+Compares the old update_camera_display work (full-frame BGR->RGB, resize,
+Image.fromarray and a new PhotoImage per frame) with the current split:
+render_preview on the capture thread, then one paste into a persistent
+PhotoImage on the Tk thread. Needs a display for the PhotoImage parts;
+without one only the conversion steps are timed.
+
+Usage: python benchmarks/bench_camera_preview.py [SOURCE] [--frames N]
+"""
+import argparse
+import os
+import sys
+import time
+import tkinter as tk
+
+import cv2
+from PIL import Image, ImageTk
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from frame_sources import open_frame_source  # noqa: E402
+from proctoring import PREVIEW_SIZE, render_preview  # noqa: E402
+
+
+def read_frames(spec, limit):
+    source = open_frame_source(spec, realtime=False)
+    frames = []
+    while len(frames) < limit:
+        ok, frame = source.read()
+        if not ok:
+            break
+        frames.append(frame)
+    source.release()
+    return frames
+
+
+def per_frame(function, frames):
+    started = time.perf_counter()
+    for frame in frames:
+        function(frame)
+    return (time.perf_counter() - started) / len(frames) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Camera preview cost per frame")
+    parser.add_argument("source", nargs="?", default="synthetic", help="frame source spec")
+    parser.add_argument("--frames", type=int, default=300)
+    args = parser.parse_args()
+    frames = read_frames(args.source, args.frames)
+    if not frames:
+        raise SystemExit("no frames read")
+    faces = [(200, 120, 180, 180)]
+    face_eyes = [[(40, 50, 30, 30), (110, 50, 30, 30)]]
+    previews = [render_preview(frame, faces, face_eyes) for frame in frames]
+
+    def old_conversion(frame):
+        return Image.fromarray(cv2.resize(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB), PREVIEW_SIZE))
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        root = None
+        print(f"no display ({e}); timing conversions only")
+
+    height, width = frames[0].shape[:2]
+    print(f"{len(frames)} frames at {width}x{height}, preview {PREVIEW_SIZE[0]}x{PREVIEW_SIZE[1]}")
+    print(f"{'step':<48}{'ms/frame':>10}")
+    print(f"{'capture thread: render_preview':<48}{per_frame(lambda f: render_preview(f, faces, face_eyes), frames):>10.3f}")
+
+    if root is None:
+        print(f"{'Tk thread, old: convert + resize + fromarray':<48}{per_frame(old_conversion, frames):>10.3f}")
+        print(f"{'Tk thread, new: fromarray':<48}{per_frame(Image.fromarray, previews):>10.3f}")
+        return
+
+    label = tk.Label(root)
+    label.pack()
+    photo = ImageTk.PhotoImage('RGB', PREVIEW_SIZE)
+
+    def old_update(frame):
+        imgtk = ImageTk.PhotoImage(image=old_conversion(frame))
+        label.imgtk = imgtk
+        label.configure(image=imgtk)
+
+    def new_update(preview):
+        photo.paste(Image.fromarray(preview))
+
+    label.configure(image=photo)
+    old_ms = per_frame(old_update, frames)
+    label.configure(image=photo)
+    new_ms = per_frame(new_update, previews)
+    root.update()
+    print(f"{'Tk thread, old: convert + new PhotoImage':<48}{old_ms:>10.3f}")
+    print(f"{'Tk thread, new: paste into one PhotoImage':<48}{new_ms:>10.3f}")
+    print(f"Tk-thread time per frame reduced {old_ms / new_ms:.1f}x")
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
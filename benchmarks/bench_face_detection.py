@@ -0,0 +1,113 @@
+"""CPU cost of proctoring face detection on recorded or generated footage.
+
+Runs the original full-resolution cascade pass, the downscaled,
+region-tracked HaarFaceDetector and the same detector behind a MotionGate
+over the same frames and compares CPU time per frame and the face-present /
+eyes-visible decisions.
+
+Usage: python benchmarks/bench_face_detection.py SOURCE [--frames N] [--face-image PATH]
+
+SOURCE is any frame source spec: a video file, an image directory or
+``synthetic[:WxH]`` (with ``--face-image`` pasted over it).
+"""
+import argparse
+import os
+import sys
+import time
+
+import cv2
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from frame_sources import open_frame_source  # noqa: E402
+from proctoring import HaarFaceDetector, MotionGate, load_cascades  # noqa: E402
+
+
+def read_frames(spec, limit, face_image=None):
+    capture = open_frame_source(spec, realtime=False, face_image=face_image)
+    if not capture.isOpened():
+        raise SystemExit(f"could not open {spec}")
+    frames = []
+    while len(frames) < limit:
+        ok, frame = capture.read()
+        if not ok:
+            break
+        frames.append(cv2.cvtColor(cv2.flip(frame, 1), cv2.COLOR_BGR2GRAY))
+    capture.release()
+    return frames
+
+
+def full_resolution(face_cascade, eye_cascade):
+    """The detection monitor_camera used to run on every frame."""
+    def detect(gray):
+        faces = face_cascade.detectMultiScale(gray, 1.3, 5)
+        eyes = [eye_cascade.detectMultiScale(gray[y:y + h, x:x + w]) for (x, y, w, h) in faces]
+        return faces, eyes
+    return detect
+
+
+def motion_gated(detector, gate, fps):
+    """``detector`` behind ``gate``, reusing the last result on static frames."""
+    state = {'frame': 0, 'result': ([], [])}
+
+    def detect(gray):
+        now = state['frame'] / fps
+        state['frame'] += 1
+        if gate.should_detect(gray, now):
+            state['result'] = detector.detect(gray)
+        return state['result']
+    return detect
+
+
+def decisions(detect, frames):
+    """CPU seconds per frame plus (face present, eyes visible) for each frame."""
+    outcomes = []
+    started = time.process_time()
+    for gray in frames:
+        faces, eyes = detect(gray)
+        # Like monitor_camera, the eye decision follows the last face in the list
+        outcomes.append((len(faces) > 0, len(faces) > 0 and len(eyes[-1]) >= 2))
+    return (time.process_time() - started) / len(frames), outcomes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Proctoring face detection cost")
+    parser.add_argument("source", help="video file, image directory or synthetic[:WxH]")
+    parser.add_argument("--frames", type=int, default=1000, help="maximum frames to read")
+    parser.add_argument("--face-image", help="face pasted into synthetic frames")
+    parser.add_argument("--fps", type=float, default=30.0, help="frame rate the footage was captured at")
+    args = parser.parse_args()
+    frames = read_frames(args.source, args.frames, args.face_image)
+    if not frames:
+        raise SystemExit("no frames decoded")
+    height, width = frames[0].shape
+    face_cascade, eye_cascade = load_cascades()
+    detector = HaarFaceDetector(face_cascade, eye_cascade)
+
+    gate = MotionGate()
+
+    baseline_cost, baseline = decisions(full_resolution(face_cascade, eye_cascade), frames)
+    pipeline_cost, pipeline = decisions(detector.detect, frames)
+    full_passes, roi_passes = detector.full_detections, detector.roi_detections
+    detector.reset()
+    gated_cost, gated = decisions(motion_gated(detector, gate, args.fps), frames)
+
+    print(f"{len(frames)} frames at {width}x{height}")
+    print(f"{'pipeline':<22}{'cpu ms/frame':>14}{'speed-up':>10}{'face present':>14}{'eyes visible':>14}"
+          f"{'face agree':>12}{'eyes agree':>12}")
+    for name, cost, outcomes in (("full resolution", baseline_cost, baseline),
+                                 ("downscaled + ROI", pipeline_cost, pipeline),
+                                 ("+ motion gate", gated_cost, gated)):
+        faces = sum(face for face, _ in outcomes)
+        eyes = sum(eye for _, eye in outcomes)
+        face_agree = sum(a[0] == b[0] for a, b in zip(baseline, outcomes)) / len(frames)
+        eye_agree = sum(a[1] == b[1] for a, b in zip(baseline, outcomes)) / len(frames)
+        print(f"{name:<22}{cost * 1000:>14.2f}{baseline_cost / cost:>9.1f}x{faces:>14}{eyes:>14}"
+              f"{face_agree:>12.1%}{eye_agree:>12.1%}")
+
+    print(f"full-frame passes {full_passes}, tracked-region passes {roi_passes}; "
+          f"motion gate skipped {gate.skip_ratio:.1%} of detections")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""Latency and accuracy of the face detector backends on labelled frames.
+
+A labelled set is a directory of images plus ``labels.csv`` with the columns
+``frame,x,y,w,h``: one row per face, or one row with empty box fields for a
+frame without a face. Record and label frames from the kiosk camera, or
+generate a set from the synthetic source:
+
+    python benchmarks/bench_face_detectors.py --make-synthetic DIR --face-image face.png
+    python benchmarks/bench_face_detectors.py DIR [--dnn-model-dir PATH]
+
+For each backend the script reports latency per frame and how often its
+face-present decision matches the labels (a missed face is what causes a
+false "face not detected" termination), plus the mean IoU of the detected
+box against the labelled one.
+"""
+import argparse
+import csv
+import os
+import sys
+import time
+
+import cv2
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from frame_sources import SyntheticSource  # noqa: E402
+from proctoring import DNN_MODEL_DIR, ProctoringConfig  # noqa: E402
+
+LABELS_FILE = "labels.csv"
+
+
+def make_synthetic(directory, face_image, frames):
+    face = cv2.imread(face_image)
+    if face is None:
+        raise SystemExit(f"could not read {face_image}")
+    os.makedirs(directory, exist_ok=True)
+    source = SyntheticSource(face=face, frames=frames, realtime=False)
+    with open(os.path.join(directory, LABELS_FILE), 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(["frame", "x", "y", "w", "h"])
+        index = 0
+        while True:
+            ok, frame = source.read()
+            if not ok:
+                break
+            name = f"{index:05d}.png"
+            cv2.imwrite(os.path.join(directory, name), frame)
+            writer.writerow([name] + (list(source.face_box) if source.face_box else ["", "", "", ""]))
+            index += 1
+    print(f"wrote {index} labelled frames to {directory}")
+
+
+def load_labelled(directory):
+    boxes = {}
+    with open(os.path.join(directory, LABELS_FILE), newline='') as f:
+        for row in csv.DictReader(f):
+            faces = boxes.setdefault(row['frame'], [])
+            if row['x']:
+                faces.append(tuple(int(row[key]) for key in ('x', 'y', 'w', 'h')))
+    frames = []
+    for name in sorted(boxes):
+        image = cv2.imread(os.path.join(directory, name))
+        if image is None:
+            raise SystemExit(f"could not read {name}")
+        frames.append((image, boxes[name]))
+    return frames
+
+
+def iou(a, b):
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    width = min(ax + aw, bx + bw) - max(ax, bx)
+    height = min(ay + ah, by + bh) - max(ay, by)
+    if width <= 0 or height <= 0:
+        return 0.0
+    overlap = width * height
+    return overlap / (aw * ah + bw * bh - overlap)
+
+
+def evaluate(detector, frames):
+    latencies = []
+    counts = {'tp': 0, 'fp': 0, 'fn': 0, 'tn': 0}
+    overlaps = []
+    for image, labelled in frames:
+        started = time.perf_counter()
+        faces, _ = detector.detect(image)
+        latencies.append(time.perf_counter() - started)
+
+        if labelled and faces:
+            counts['tp'] += 1
+            overlaps.append(max(iou(face, box) for face in faces for box in labelled))
+        elif faces:
+            counts['fp'] += 1
+        elif labelled:
+            counts['fn'] += 1
+        else:
+            counts['tn'] += 1
+    latencies.sort()
+    return latencies, counts, overlaps
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare face detector backends on labelled frames")
+    parser.add_argument("directory", help="labelled frame directory")
+    parser.add_argument("--dnn-model-dir", default=DNN_MODEL_DIR)
+    parser.add_argument("--make-synthetic", action="store_true",
+                        help="generate a labelled synthetic set into DIRECTORY instead of benchmarking")
+    parser.add_argument("--face-image", help="face image for --make-synthetic")
+    parser.add_argument("--frames", type=int, default=300, help="frames for --make-synthetic")
+    args = parser.parse_args()
+
+    if args.make_synthetic:
+        if not args.face_image:
+            raise SystemExit("--make-synthetic needs --face-image")
+        make_synthetic(args.directory, args.face_image, args.frames)
+        return
+
+    frames = load_labelled(args.directory)
+    with_face = sum(1 for _, labelled in frames if labelled)
+    print(f"{len(frames)} labelled frames, {with_face} with a face")
+    print(f"{'backend':<10}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'accuracy':>10}"
+          f"{'missed':>8}{'false':>8}{'mean IoU':>10}")
+
+    for backend in ("haar", "dnn"):
+        config = ProctoringConfig(detector=backend, dnn_model_dir=args.dnn_model_dir)
+        try:
+            detector = config.create_detector()
+        except RuntimeError as e:
+            print(f"{backend:<10}skipped: {e}")
+            continue
+        latencies, counts, overlaps = evaluate(detector, frames)
+        accuracy = (counts['tp'] + counts['tn']) / len(frames)
+        mean_iou = sum(overlaps) / len(overlaps) if overlaps else 0.0
+        print(f"{backend:<10}{sum(latencies) / len(latencies) * 1000:>10.2f}"
+              f"{latencies[len(latencies) // 2] * 1000:>10.2f}"
+              f"{latencies[int(len(latencies) * 0.95)] * 1000:>10.2f}"
+              f"{accuracy:>10.1%}{counts['fn']:>8}{counts['fp']:>8}{mean_iou:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""Tk-thread cost of the results-screen celebration.
+
+Runs the old firecracker + confetti animation (one tk.Label per particle,
+each with its own after loop) and the canvas ParticleSystem for the same
+effects, and reports widgets/items created, start-up time and Tk time per
+animation frame. Needs a display for the Tk part; without one only the
+NumPy particle step is timed.
+
+Usage: python benchmarks/bench_particles.py [--seconds S]
+"""
+import argparse
+import math
+import os
+import random
+import sys
+import time
+import tkinter as tk
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from animation import AnimationScheduler  # noqa: E402
+from particles import PARTICLE_BUDGET, ParticleSystem, confetti, firecracker  # noqa: E402
+
+
+def old_celebration(root, width, height):
+    """30 firecracker bursts of 24 labels plus 30 confetti labels, as show_results used to do."""
+    labels = []
+
+    def explode(label, start_x, start_y, angle, max_distance, distance=0):
+        if distance < max_distance and label.winfo_exists():
+            distance += random.randint(8, 15)
+            label.place(x=start_x + distance * math.cos(math.radians(angle)),
+                        y=start_y + distance * math.sin(math.radians(angle)))
+            root.after(40, lambda: explode(label, start_x, start_y, angle, max_distance, distance))
+        elif label.winfo_exists():
+            label.place_forget()
+
+    def fall(label, start_x, y):
+        if y < height and label.winfo_exists():
+            y += random.randint(5, 15)
+            label.place(x=start_x + random.randint(-5, 5), y=y)
+            root.after(50, lambda: fall(label, start_x, y))
+
+    for _ in range(30):
+        x, y = random.randint(50, width - 50), random.randint(50, height - 50)
+        for angle in range(0, 360, 15):
+            label = tk.Label(root, text='💥', font=("Arial", random.randint(20, 40)), bg='#1a1a2e')
+            label.place(x=x, y=y)
+            labels.append(label)
+            explode(label, x, y, angle, random.randint(80, 150))
+    for _ in range(30):
+        x, y = random.randint(100, width - 100), random.randint(0, 150)
+        label = tk.Label(root, text='🎉', font=("Arial", random.randint(20, 40)), bg='#1a1a2e')
+        label.place(x=x, y=y)
+        labels.append(label)
+        fall(label, x, y)
+    return labels
+
+
+def run_for(root, seconds):
+    """Process Tk events for ``seconds``; returns (frames drawn, busy seconds)."""
+    frames = 0
+    busy = 0.0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        root.update()
+        busy += time.perf_counter() - started
+        frames += 1
+        time.sleep(0.005)
+    return frames, busy
+
+
+def numpy_step_only():
+    class Canvas:
+        """Just enough canvas for ParticleSystem to run without a display."""
+
+        def create_text(self, *args, **kwargs):
+            return 1
+
+        def coords(self, *args):
+            pass
+
+        def itemconfigure(self, *args, **kwargs):
+            pass
+
+        def after(self, ms, function):
+            return None
+
+        def winfo_exists(self):
+            return True
+
+    canvas = Canvas()
+    system = ParticleSystem(canvas, AnimationScheduler(canvas), seed=0)
+    system.life[:] = 1e9
+    system.position[:] = np.random.default_rng(0).uniform(0, 1000, (PARTICLE_BUDGET, 2))
+    system.items = [1] * PARTICLE_BUDGET
+    steps = 1000
+    started = time.perf_counter()
+    for step in range(steps):
+        system.step(started + step / 30)
+    print(f"{PARTICLE_BUDGET} particles: {(time.perf_counter() - started) / steps * 1000:.3f} ms per step "
+          f"(array update + one coords call per particle)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Celebration animation cost")
+    parser.add_argument("--seconds", type=float, default=3.0)
+    args = parser.parse_args()
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"no display ({e}); timing the particle step only")
+        numpy_step_only()
+        return
+
+    width, height = 1920, 1080
+    root.geometry(f"{width}x{height}")
+    root.update()
+
+    started = time.perf_counter()
+    labels = old_celebration(root, width, height)
+    old_start = time.perf_counter() - started
+    old_frames, old_busy = run_for(root, args.seconds)
+    for label in labels:
+        label.destroy()
+
+    canvas = tk.Canvas(root, bg='#1a1a2e', highlightthickness=0)
+    canvas.place(x=0, y=0, relwidth=1, relheight=1)
+    scheduler = AnimationScheduler(root)
+    system = ParticleSystem(canvas, scheduler)
+    started = time.perf_counter()
+    firecracker(system, width, height)
+    confetti(system, width, height)
+    new_start = time.perf_counter() - started
+    new_frames, new_busy = run_for(root, args.seconds)
+
+    print(f"{'':<16}{'objects':>10}{'start ms':>10}{'Tk busy ms/update':>20}")
+    print(f"{'tk.Label':<16}{len(labels):>10}{old_start * 1000:>10.1f}{old_busy / old_frames * 1000:>20.2f}")
+    print(f"{'ParticleSystem':<16}{len(canvas.find_all()):>10}{new_start * 1000:>10.1f}"
+          f"{new_busy / new_frames * 1000:>20.2f}")
+    print(f"particles dropped over budget: {system.dropped}, steps: {system.steps}, "
+          f"quality level {scheduler.level} ({scheduler.fps} fps), smoothed frame cost "
+          f"{scheduler.frame_cost * 1000:.2f} ms")
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
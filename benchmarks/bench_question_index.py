@@ -0,0 +1,73 @@
+"""Lookup latency of QuestionIndex on a synthetic bank.
+
+Usage: python benchmarks/bench_question_index.py [num_questions]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from question_bank import QuestionStore  # noqa: E402
+from question_index import QuestionIndex  # noqa: E402
+
+CATEGORIES = ["Science", "Geography", "History", "Sports", "Music", "Movies", "Literature", "Art"]
+DIFFICULTIES = ["easy", "medium", "hard"]
+TAGS = ["space", "animals", "capitals", "olympics", "famous-people", "chemistry", "rivers", "inventions",
+        "oceans", "wars", "painters", "composers"]
+
+
+def build_bank(count, seed=99):
+    rng = random.Random(seed)
+    words = [f"word{i}" for i in range(20000)]
+    store = QuestionStore()
+    for _ in range(count):
+        store.append(
+            " ".join(rng.choice(words) for _ in range(12)) + "?",
+            [rng.choice(words) for _ in range(4)],
+            rng.randrange(4),
+            rng.choice(CATEGORIES),
+            rng.choice(DIFFICULTIES),
+            rng.sample(TAGS, rng.randint(0, 3))
+        )
+    store.freeze()
+    return store
+
+
+def timed(function, repeat=200):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = function()
+    return (time.perf_counter() - started) / repeat, len(result)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    store = build_bank(count)
+
+    started = time.perf_counter()
+    index = QuestionIndex(store)
+    label_build = time.perf_counter() - started
+    started = time.perf_counter()
+    index.search("word1")
+    word_build = time.perf_counter() - started
+
+    print(f"{count} questions: label index {label_build * 1000:.0f} ms, word index {word_build * 1000:.0f} ms")
+    queries = [
+        ("category", lambda: index.find(categories=["Science"])),
+        ("category + difficulty", lambda: index.find(categories=["Science", "History"], difficulties=["easy"])),
+        ("tag", lambda: index.find(tags=["space"])),
+        ("category + 2 tags", lambda: index.find(categories=["Geography"], tags=["capitals", "rivers"])),
+        ("text, 1 word", lambda: index.search("word42")),
+        ("text, 2 words", lambda: index.search("word42 word43")),
+        ("tag + text", lambda: index.find(tags=["space"], text="word7")),
+    ]
+    print(f"{'query':<24}{'ms':>10}{'matches':>10}")
+    for name, query in queries:
+        seconds, matches = timed(query)
+        print(f"{name:<24}{seconds * 1000:>10.3f}{matches:>10}")
+
+
+if __name__ == "__main__":
+    main()
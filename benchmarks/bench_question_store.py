@@ -0,0 +1,72 @@
+"""Memory per question: list-of-dicts bank vs QuestionStore.
+
+Usage: python benchmarks/bench_question_store.py [num_questions]
+"""
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from question_bank import QuestionStore  # noqa: E402
+
+
+def synthetic_rows(count, seed=1234):
+    """Yield sheet-like rows; options reuse a small vocabulary like real quizzes do."""
+    rng = random.Random(seed)
+    vocabulary = ["True", "False", "None of these", "All of the above"] + [str(n) for n in range(500)]
+    for i in range(count):
+        options = [rng.choice(vocabulary) for _ in range(3)] + [f"Option text number {i}"]
+        yield {
+            'question': f"Question {i}: which of the following statements about topic {i % 997} is correct?",
+            'options': options,
+            'correct_answer': rng.choice("ABCD")
+        }
+
+
+def measure(build, count):
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    bank = build(synthetic_rows(count))
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return bank, current, elapsed
+
+
+def build_dicts(rows):
+    # Mirrors the original QuizGame.all_questions layout
+    return [{'question': r['question'], 'options': list(r['options']), 'correct_answer': r['correct_answer']}
+            for r in rows]
+
+
+def build_store(rows):
+    store = QuestionStore.from_dicts(rows)
+    store.freeze()
+    return store
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    results = []
+    for name, build in (("list of dicts", build_dicts), ("QuestionStore", build_store)):
+        bank, size, elapsed = measure(build, count)
+        assert len(bank) == count
+        results.append((name, size, elapsed))
+        del bank
+
+    print(f"{count} questions")
+    print(f"{'layout':<16}{'MiB':>10}{'bytes/question':>18}{'build s':>10}")
+    for name, size, elapsed in results:
+        print(f"{name:<16}{size / 2 ** 20:>10.1f}{size / count:>18.0f}{elapsed:>10.2f}")
+    print(f"reduction: {results[0][1] / results[1][1]:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
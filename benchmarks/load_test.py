@@ -0,0 +1,309 @@
+"""Load generator: simulated candidates taking quizzes concurrently.
+
+Each candidate starts a quiz, answers or skips every question and fetches
+the results. Per-step latency percentiles, overall throughput and memory per
+live session are reported.
+
+    python benchmarks/load_test.py --mode engine --candidates 10000
+    python benchmarks/load_test.py --mode http --candidates 2000 --concurrency 200
+    python benchmarks/load_test.py --mode http --url http://127.0.0.1:8080
+
+``engine`` drives QuizEngine in-process (selection, check_answer and results
+logic only). ``http`` goes through the quiz server; without ``--url`` an
+in-process server on an ephemeral localhost port is started. ``--url`` is
+only accepted with ``--mode http``.
+"""
+import argparse
+import asyncio
+import gc
+import json
+import math
+import os
+import random
+import sys
+import time
+import tracemalloc
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from question_bank import QuestionStore  # noqa: E402
+from quiz_engine import QuizEngine  # noqa: E402
+from quiz_server import QuizServer  # noqa: E402
+from sampling import QuestionSampler  # noqa: E402
+
+STEPS = ("start", "answer", "skip", "results")
+
+
+def synthetic_bank(size, seed=7):
+    rng = random.Random(seed)
+    store = QuestionStore()
+    for i in range(size):
+        store.append(
+            f"Synthetic question {i}: what is {i} modulo 4?",
+            [f"{i}-{letter}" for letter in "abcd"],
+            rng.randrange(4),
+            rng.choice(["Science", "History", "Geography"]),
+            rng.choice(["easy", "medium", "hard"])
+        )
+    store.freeze()
+    store.strata()
+    return store
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile: the smallest value with at least ``fraction`` of the samples at or below it."""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[max(0, math.ceil(fraction * len(sorted_values)) - 1)]
+
+
+class Recorder:
+    def __init__(self):
+        self.samples = {step: [] for step in STEPS}
+
+    def record(self, step, started):
+        self.samples[step].append(time.perf_counter() - started)
+
+    def report(self, elapsed, candidates):
+        print(f"{candidates} candidates in {elapsed:.2f} s -> {candidates / elapsed:,.0f} quizzes/s")
+        print(f"{'step':<10}{'count':>10}{'ops/s':>12}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+        for step in STEPS:
+            values = sorted(self.samples[step])
+            if not values:
+                continue
+            print(f"{step:<10}{len(values):>10}{len(values) / elapsed:>12,.0f}"
+                  f"{percentile(values, 0.50) * 1000:>10.3f}"
+                  f"{percentile(values, 0.95) * 1000:>10.3f}"
+                  f"{percentile(values, 0.99) * 1000:>10.3f}"
+                  f"{values[-1] * 1000:>10.3f}")
+
+
+# -- in-process engine ---------------------------------------------------------
+
+async def engine_candidate(candidate, bank, sampler, args, recorder, rng):
+    started = time.perf_counter()
+    engine = QuizEngine(bank, sampler=sampler)
+    engine.start(args.questions)
+    recorder.record("start", started)
+    await asyncio.sleep(0)
+
+    while not engine.finished:
+        if rng.random() < args.skip_rate:
+            started = time.perf_counter()
+            engine.skip()
+            recorder.record("skip", started)
+        else:
+            started = time.perf_counter()
+            engine.answer(rng.choice("ABCD"))
+            recorder.record("answer", started)
+        await asyncio.sleep(0)
+
+    started = time.perf_counter()
+    engine.results()
+    recorder.record("results", started)
+    return engine
+
+
+def engine_session_memory(bank, sampler, args, count=2000):
+    """Bytes allocated per live, finished QuizEngine session."""
+    rng = random.Random(args.seed)
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    engines = []
+    for _ in range(count):
+        engine = QuizEngine(bank, sampler=sampler)
+        engine.start(args.questions)
+        while not engine.finished:
+            engine.answer(rng.choice("ABCD"))
+        engines.append(engine)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / count
+
+
+# -- HTTP against the quiz server ---------------------------------------------
+
+class HTTPConnection:
+    """Minimal keep-alive HTTP/1.1 JSON client on asyncio streams."""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    async def request(self, method, path, payload=None):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        body = json.dumps(payload).encode('utf-8') if payload is not None else b''
+        head = (f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n")
+        self.writer.write(head.encode('latin-1') + body)
+        await self.writer.drain()
+
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            if name.lower() == 'content-length':
+                length = int(value)
+        data = json.loads(await self.reader.readexactly(length)) if length else None
+        if status >= 400:
+            raise RuntimeError(f"{method} {path} -> {status}: {data}")
+        return data
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            await self.writer.wait_closed()
+
+
+async def http_candidate(candidate, connection, args, recorder, rng):
+    started = time.perf_counter()
+    state = await connection.request("POST", "/sessions",
+                                     {'candidate': f"candidate-{candidate}", 'num_questions': args.questions})
+    recorder.record("start", started)
+    session_path = f"/sessions/{state['session_id']}"
+
+    while not state['finished']:
+        if rng.random() < args.skip_rate:
+            started = time.perf_counter()
+            state = await connection.request("POST", session_path + "/skip")
+            recorder.record("skip", started)
+        else:
+            started = time.perf_counter()
+            state = await connection.request("POST", session_path + "/answer", {'answer': rng.choice("ABCD")})
+            recorder.record("answer", started)
+
+    started = time.perf_counter()
+    await connection.request("GET", session_path + "/results")
+    recorder.record("results", started)
+
+
+def server_session_memory(server, args, count=2000):
+    """Bytes allocated per live, finished server session."""
+    rng = random.Random(args.seed)
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for i in range(count):
+        session = server.create_session(candidate=f"memory-{i}", num_questions=args.questions)
+        while not session.engine.finished:
+            session.engine.answer(rng.choice("ABCD"))
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / count
+
+
+# -- driver ---------------------------------------------------------------------
+
+async def run_candidates(args, driver):
+    """Run ``args.candidates`` candidates with at most ``args.concurrency`` in flight."""
+    queue = asyncio.Queue()
+    for candidate in range(args.candidates):
+        queue.put_nowait(candidate)
+
+    async def worker(worker_id):
+        rng = random.Random(args.seed * 1000003 + worker_id)
+        context = await driver.open()
+        try:
+            while not queue.empty():
+                candidate = queue.get_nowait()
+                await driver.run(candidate, context, rng)
+        finally:
+            await driver.close(context)
+
+    await asyncio.gather(*(worker(i) for i in range(min(args.concurrency, args.candidates))))
+
+
+class EngineDriver:
+    def __init__(self, bank, args, recorder):
+        self.bank = bank
+        self.sampler = QuestionSampler(bank)
+        self.args = args
+        self.recorder = recorder
+
+    async def open(self):
+        return None
+
+    async def run(self, candidate, context, rng):
+        await engine_candidate(candidate, self.bank, self.sampler, self.args, self.recorder, rng)
+
+    async def close(self, context):
+        pass
+
+
+class HTTPDriver:
+    def __init__(self, host, port, args, recorder):
+        self.host = host
+        self.port = port
+        self.args = args
+        self.recorder = recorder
+
+    async def open(self):
+        return HTTPConnection(self.host, self.port)
+
+    async def run(self, candidate, connection, rng):
+        await http_candidate(candidate, connection, self.args, self.recorder, rng)
+
+    async def close(self, connection):
+        await connection.close()
+
+
+async def main_async(args):
+    recorder = Recorder()
+    bank = synthetic_bank(args.bank_size)
+    server = listener = None
+
+    if args.mode == "engine":
+        driver = EngineDriver(bank, args, recorder)
+    elif args.url:
+        parts = urlsplit(args.url)
+        driver = HTTPDriver(parts.hostname, parts.port or 80, args, recorder)
+    else:
+        server = QuizServer(bank)
+        listener = await asyncio.start_server(server.handle_connection, "127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        driver = HTTPDriver("127.0.0.1", port, args, recorder)
+
+    target = args.url or ("in-process server" if args.mode == "http" else "in-process engine")
+    print(f"mode={args.mode} target={target} bank={args.bank_size} questions/quiz={args.questions} "
+          f"concurrency={args.concurrency} skip_rate={args.skip_rate}")
+
+    started = time.perf_counter()
+    await run_candidates(args, driver)
+    elapsed = time.perf_counter() - started
+    recorder.report(elapsed, args.candidates)
+
+    if args.mode == "engine":
+        print(f"memory per session: {engine_session_memory(bank, driver.sampler, args):,.0f} bytes")
+    elif server is not None:
+        print(f"live sessions held by server: {len(server.sessions)}")
+        print(f"memory per server session: {server_session_memory(server, args):,.0f} bytes")
+        listener.close()
+        await listener.wait_closed()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate many candidates taking quizzes")
+    parser.add_argument("--mode", choices=("engine", "http"), default="engine")
+    parser.add_argument("--url", help="quiz server to target in http mode (default: start one in-process)")
+    parser.add_argument("--candidates", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--questions", type=int, default=5, help="questions per quiz")
+    parser.add_argument("--bank-size", type=int, default=100000, help="synthetic question bank size")
+    parser.add_argument("--skip-rate", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+    if args.url and args.mode != "http":
+        parser.error("--url needs --mode http")
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
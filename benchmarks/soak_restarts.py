@@ -0,0 +1,100 @@
+"""Soak test: restart the quiz many times and watch for leaks.
+
+Drives a real QuizGame window (synthetic camera, built-in questions).
+Each cycle answers a question, leaving the next-question timers pending,
+shows the results screen on every other cycle, then restarts. Every
+``--report`` restarts it prints pending ``after`` callbacks, Tcl commands
+(every Python callback Tk can call holds one), widgets, threads and
+traced Python memory. The script exits with status 1 if callbacks,
+commands or widgets end higher than at the first report, or if memory grew
+by more than ``--memory-slack`` MB. Needs a display.
+
+Usage: python benchmarks/soak_restarts.py [--restarts N] [--report N]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+import tkinter as tk
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from proctoring import ProctoringConfig  # noqa: E402
+from question_bank import DEFAULT_QUESTIONS, QuestionStore  # noqa: E402
+from quiz import QuizGame  # noqa: E402
+from timers import pending_after, pump  # noqa: E402
+
+
+def count_widgets(widget):
+    return 1 + sum(count_widgets(child) for child in widget.winfo_children())
+
+
+def snapshot(root, game):
+    return {
+        'after': pending_after(root),
+        'registry': len(game.timers),
+        'commands': len(root.tk.splitlist(root.tk.call('info', 'commands'))),
+        'widgets': count_widgets(root),
+        'threads': threading.active_count(),
+        'memory_mb': tracemalloc.get_traced_memory()[0] / 1e6,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Quiz restart soak test")
+    parser.add_argument("--restarts", type=int, default=1000)
+    parser.add_argument("--report", type=int, default=100, help="print a snapshot every N restarts")
+    parser.add_argument("--memory-slack", type=float, default=2.0, help="allowed memory growth in MB")
+    args = parser.parse_args()
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        raise SystemExit(f"needs a display: {e}")
+
+    # No face in the synthetic frames, so never time out on a missing face
+    game = QuizGame(root, ProctoringConfig(source="synthetic", face_missing_seconds=float("inf")))
+    # Focus changes while the script drives the window must not end the quiz
+    root.unbind('<FocusOut>')
+    game.set_question_bank(QuestionStore.from_dicts(DEFAULT_QUESTIONS))
+    game.start_loaded_quiz()
+    # Let the background question loader finish before measuring
+    pump(root, 2.0)
+    tracemalloc.start()
+
+    print(f"{'restart':>8}{'after':>8}{'registry':>10}{'commands':>10}{'widgets':>9}{'threads':>9}{'memory MB':>11}")
+    first = None
+    started = time.perf_counter()
+    for restart in range(1, args.restarts + 1):
+        game.select_option(restart % 4)
+        game.check_answer()
+        pump(root, 0.02)
+        if restart % 2 == 0:
+            game.show_results()
+            pump(root, 0.02)
+        game.restart_quiz()
+        pump(root, 0.02)
+
+        if restart % args.report == 0:
+            stats = snapshot(root, game)
+            first = first or stats
+            print(f"{restart:>8}{stats['after']:>8}{stats['registry']:>10}{stats['commands']:>10}"
+                  f"{stats['widgets']:>9}{stats['threads']:>9}{stats['memory_mb']:>11.2f}")
+    elapsed = time.perf_counter() - started
+    last = snapshot(root, game)
+    first = first or last
+    game.stop_camera()
+    root.destroy()
+
+    print(f"{args.restarts} restarts in {elapsed:.1f} s ({elapsed / args.restarts * 1000:.1f} ms each)")
+    grew = [key for key in ('after', 'commands', 'widgets') if last[key] > first[key]]
+    if last['memory_mb'] - first['memory_mb'] > args.memory_slack:
+        grew.append('memory_mb')
+    if grew:
+        raise SystemExit(f"grew across restarts: {', '.join(grew)}")
+    print("flat across restarts")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,330 @@
+"""Frame sources for the proctoring camera.
+
+Everything that feeds ``monitor_camera`` looks like a ``cv2.VideoCapture``:
+``read() -> (ok, frame)``, ``isOpened()`` and ``release()``. Besides the live
+camera there are sources for a recorded video, a directory of images and a
+synthetic generator, so the detection loop can be run and benchmarked on
+machines without a webcam. ``open_frame_source`` picks one from a spec string:
+
+    camera, camera:1, 0        live camera (device index)
+    path/to/video.mp4          recorded video
+    path/to/frames/            images in name order
+    synthetic, synthetic:WxH   generated frames (optionally with a face image)
+
+File, directory and synthetic sources are paced to their frame rate by
+default, like a camera; pass ``realtime=False`` to read as fast as possible.
+
+``CaptureSupervisor`` wraps a source for the monitoring thread: failed reads
+back off instead of spinning, the device is reopened after repeated failures,
+and a health state is kept for the UI. ``FrameExchange`` hands the latest
+frame from that thread to the Tk preview.
+"""
+import math
+import os
+import threading
+import time
+
+import cv2
+import numpy as np
+
+CAMERA_SOURCE_ENV = "BRAIN_BUSTER_CAMERA"
+DEFAULT_SOURCE = os.environ.get(CAMERA_SOURCE_ENV, "camera")
+DEFAULT_FPS = 30.0
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp')
+
+HEALTH_OK = "ok"
+HEALTH_DEGRADED = "degraded"
+HEALTH_OFFLINE = "offline"
+HEALTH_STOPPED = "stopped"
+# Only a ProctoringWorker reports this, until its process has opened the source
+HEALTH_STARTING = "starting"
+
+BACKOFF_INITIAL = 0.01
+BACKOFF_MAX = 2.0
+REOPEN_AFTER_FAILURES = 5
+
+
+class _Pacer:
+    """Sleeps so frames come out no faster than ``fps``."""
+
+    def __init__(self, fps, realtime):
+        self.interval = 1.0 / fps if realtime and fps > 0 else 0.0
+        self.next_frame = None
+
+    def wait(self):
+        if not self.interval:
+            return
+        now = time.monotonic()
+        if self.next_frame is None or now - self.next_frame > self.interval:
+            self.next_frame = now
+        elif now < self.next_frame:
+            time.sleep(self.next_frame - now)
+        self.next_frame += self.interval
+
+
+class VideoFileSource:
+    """A recorded video, optionally looped."""
+
+    def __init__(self, path, loop=False, realtime=True):
+        self.path = path
+        self.loop = loop
+        self.capture = cv2.VideoCapture(path)
+        fps = self.capture.get(cv2.CAP_PROP_FPS) if self.capture.isOpened() else 0
+        self.fps = fps if fps and fps > 0 else DEFAULT_FPS
+        self.pacer = _Pacer(self.fps, realtime)
+
+    def read(self):
+        self.pacer.wait()
+        ok, frame = self.capture.read()
+        if not ok and self.loop:
+            self.capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ok, frame = self.capture.read()
+        return ok, frame
+
+    def isOpened(self):
+        return self.capture.isOpened()
+
+    def release(self):
+        self.capture.release()
+
+
+class ImageDirectorySource:
+    """Every image in a directory, in file name order."""
+
+    def __init__(self, path, fps=DEFAULT_FPS, loop=False, realtime=True):
+        self.paths = sorted(
+            os.path.join(path, name) for name in os.listdir(path)
+            if name.lower().endswith(IMAGE_EXTENSIONS)
+        )
+        self.fps = fps
+        self.loop = loop
+        self.position = 0
+        self.opened = bool(self.paths)
+        self.pacer = _Pacer(fps, realtime)
+
+    def read(self):
+        if not self.opened:
+            return False, None
+        if self.position >= len(self.paths):
+            if not self.loop:
+                return False, None
+            self.position = 0
+        self.pacer.wait()
+        frame = cv2.imread(self.paths[self.position])
+        self.position += 1
+        return frame is not None, frame
+
+    def isOpened(self):
+        return self.opened
+
+    def release(self):
+        self.opened = False
+
+
+class SyntheticSource:
+    """Generated frames: a noisy background with an optional face image moving over it.
+
+    With ``face`` (a BGR image) the face drifts along a smooth path and is
+    left out for ``absent_seconds`` out of every ``period_seconds``, which
+    exercises both the tracking and the face-missing paths. ``frames`` limits
+    the length; by default the source never ends. ``face_box`` is the
+    ``(x, y, w, h)`` of the face in the last frame read, or None, which makes
+    the generated frames usable as labelled test data.
+    """
+
+    def __init__(self, width=640, height=480, fps=DEFAULT_FPS, face=None, frames=None,
+                 absent_seconds=1.5, period_seconds=10.0, seed=0, realtime=True):
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.face = face
+        self.frames = frames
+        self.absent_seconds = absent_seconds
+        self.period_seconds = period_seconds
+        self.position = 0
+        self.opened = True
+        self.face_box = None
+        self.pacer = _Pacer(fps, realtime)
+
+        rng = np.random.default_rng(seed)
+        background = (rng.random((height, width, 3)) * 60 + 90).astype(np.uint8)
+        self.background = cv2.GaussianBlur(background, (15, 15), 0)
+        # A few noise frames reused in turn, so generating a frame stays cheap
+        self.noise = [(rng.random((height, width, 3)) * 12).astype(np.uint8) for _ in range(8)]
+
+    def read(self):
+        if not self.opened or (self.frames is not None and self.position >= self.frames):
+            return False, None
+        self.pacer.wait()
+        frame = cv2.add(self.background, self.noise[self.position % len(self.noise)])
+        self.face_box = None
+        if self.face is not None and self._face_visible():
+            x, y = self._face_origin()
+            face_height, face_width = self.face.shape[:2]
+            frame[y:y + face_height, x:x + face_width] = self.face
+            self.face_box = (x, y, face_width, face_height)
+        self.position += 1
+        return True, frame
+
+    def _face_visible(self):
+        seconds = (self.position / self.fps) % self.period_seconds
+        return seconds < self.period_seconds - self.absent_seconds
+
+    def _face_origin(self):
+        face_height, face_width = self.face.shape[:2]
+        free_x = max(0, self.width - face_width)
+        free_y = max(0, self.height - face_height)
+        t = self.position / self.fps
+        x = int(free_x * (0.5 + 0.4 * math.sin(t * 1.2)))
+        y = int(free_y * (0.5 + 0.4 * math.sin(t * 1.8)))
+        return x, y
+
+    def isOpened(self):
+        return self.opened
+
+    def release(self):
+        self.opened = False
+
+
+def open_frame_source(spec=None, realtime=True, face_image=None):
+    """Open the frame source described by ``spec`` (see the module docstring)."""
+    spec = str(spec if spec is not None else DEFAULT_SOURCE).strip()
+
+    if spec == "camera" or spec.startswith("camera:") or spec.isdigit():
+        index = spec.split(":", 1)[1] if ":" in spec else ("0" if spec == "camera" else spec)
+        return cv2.VideoCapture(int(index))
+
+    if spec == "synthetic" or spec.startswith("synthetic:"):
+        width, height = 640, 480
+        if ":" in spec:
+            width, height = (int(part) for part in spec.split(":", 1)[1].lower().split("x"))
+        face = cv2.imread(face_image) if face_image else None
+        if face_image and face is None:
+            raise ValueError(f"could not read face image {face_image}")
+        return SyntheticSource(width, height, face=face, realtime=realtime)
+
+    if os.path.isdir(spec):
+        return ImageDirectorySource(spec, realtime=realtime)
+    return VideoFileSource(spec, realtime=realtime)
+
+
+class CaptureSupervisor:
+    """Reads from a frame source, backing off and reopening it when it fails.
+
+    ``open_source`` is called to (re)create the source. A failed read sleeps
+    for an exponentially growing delay, capped at ``max_backoff``, so a
+    camera that stops delivering frames does not burn a core. Every
+    ``reopen_after`` consecutive failures the source is released and opened
+    again. ``health`` is one of the ``HEALTH_*`` states and can be read from
+    any thread.
+    """
+
+    def __init__(self, open_source, initial_backoff=BACKOFF_INITIAL, max_backoff=BACKOFF_MAX,
+                 reopen_after=REOPEN_AFTER_FAILURES):
+        self.open_source = open_source
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.reopen_after = reopen_after
+
+        self.consecutive_failures = 0
+        self.total_failures = 0
+        self.reopens = 0
+        self.frames = 0
+        self.last_frame_time = None
+        self._stopped = threading.Event()
+        self.source = open_source()
+        self.health = HEALTH_OK if self.source.isOpened() else HEALTH_OFFLINE
+
+    def read(self):
+        if self._stopped.is_set():
+            return False, None
+        try:
+            ok, frame = self.source.read()
+        except cv2.error:
+            ok, frame = False, None
+        if ok and frame is not None:
+            self.consecutive_failures = 0
+            self.frames += 1
+            self.last_frame_time = time.monotonic()
+            self.health = HEALTH_OK
+            return True, frame
+
+        self.consecutive_failures += 1
+        self.total_failures += 1
+        if self.consecutive_failures % self.reopen_after == 0:
+            self.health = HEALTH_OFFLINE
+            self._reopen()
+        elif self.health == HEALTH_OK:
+            self.health = HEALTH_DEGRADED
+        self._stopped.wait(self.backoff_delay())
+        return False, None
+
+    def backoff_delay(self):
+        if not self.consecutive_failures:
+            return 0.0
+        exponent = min(self.consecutive_failures - 1, 30)
+        return min(self.max_backoff, self.initial_backoff * 2 ** exponent)
+
+    def _reopen(self):
+        try:
+            self.source.release()
+        except cv2.error:
+            pass
+        if self._stopped.is_set():
+            return
+        self.reopens += 1
+        try:
+            source = self.open_source()
+        except cv2.error:
+            return
+        self.source = source
+        if self._stopped.is_set():
+            # release() ran while the device was being reopened
+            source.release()
+
+    def stats(self):
+        return {
+            'health': self.health,
+            'frames': self.frames,
+            'consecutive_failures': self.consecutive_failures,
+            'total_failures': self.total_failures,
+            'reopens': self.reopens,
+            'backoff': self.backoff_delay()
+        }
+
+    def isOpened(self):
+        return self.source.isOpened()
+
+    def release(self):
+        """Stop reading; wakes a read that is sleeping in backoff."""
+        self._stopped.set()
+        self.health = HEALTH_STOPPED
+        self.source.release()
+
+
+class FrameExchange:
+    """Single-slot hand-off of the newest frame from one producer thread to a consumer.
+
+    The slot holds an immutable ``(sequence, frame)`` tuple that is replaced
+    with a single reference assignment, so a reader always sees a matching
+    pair without taking a lock. The producer must not modify a frame after
+    publishing it. Frames the consumer never picked up are simply replaced;
+    the gap in sequence numbers says how many were skipped.
+    """
+
+    def __init__(self):
+        self._slot = (0, None)
+
+    def publish(self, frame):
+        sequence = self._slot[0] + 1
+        self._slot = (sequence, frame)
+        return sequence
+
+    def latest(self):
+        """``(sequence, frame)`` of the newest frame; sequence 0 means none yet."""
+        return self._slot
+
+    def newer_than(self, sequence):
+        """The newest ``(sequence, frame)`` if it is newer than ``sequence``, else None."""
+        slot = self._slot
+        return slot if slot[0] > sequence else None
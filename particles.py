@@ -0,0 +1,287 @@
+"""Canvas particle effects for the quiz celebrations.
+
+The fireworks, firecracker and confetti effects used to place one
+``tk.Label`` per particle, each moved by its own ``after`` loop: over 800
+widgets and timers when the results screen opens. ``ParticleSystem`` keeps
+every particle in NumPy arrays instead (position, velocity, gravity,
+remaining life), advances them all in one step per frame as a single
+animation of an ``AnimationScheduler``, and draws them as text items on one
+canvas. Particles live in a fixed number of slots (``budget``); an effect
+that asks for more than is free gets only what fits, and the canvas items of
+expired particles are hidden and reused. When the scheduler lowers quality
+only its ``particle_scale`` share of the budget is used: new effects emit
+fewer particles and live ones beyond that share are retired.
+
+Canvas items are always drawn below the widgets placed over the canvas, so
+particles are raised above the other items of their canvas but cannot cover
+a widget. The effects therefore take the ``regions`` of the screen left
+free by the widgets (see ``free_regions``) and keep their particles inside
+them: bursts start in a region and are no wider than it, confetti stops at
+its region's bottom edge.
+
+``fireworks``, ``firecracker`` and ``confetti`` emit the quiz's effects into
+a system.
+"""
+import numpy as np
+
+PARTICLE_BUDGET = 400
+MAX_STEP_SECONDS = 0.1
+PARTICLE_FONT = "Arial"
+PARTICLE_TAG = "particle"
+# Bursts need room for at least this radius, glyph included, or are not emitted in a region
+MIN_BURST_RADIUS = 20
+
+SPARKLE_COLORS = ['#FFD700', '#FF6347', '#00FF00', '#1E90FF', '#FF69B4', '#FFA500',
+                  '#00FFFF', '#FF1493', '#7FFF00', '#FF4500']
+FIRECRACKER_GLYPHS = ['💥', '✨', '🎆', '🎇', '⭐']
+CONFETTI_GLYPHS = ['🎉', '🎊', '✨', '⭐', '🌟', '💫']
+CONFETTI_COLORS = ['#FFD700', '#FF6347', '#00FF00', '#1E90FF', '#FF69B4', '#FFA500']
+
+
+class ParticleSystem:
+    """Fixed-size particle pool drawn on ``canvas`` and stepped by ``scheduler``."""
+
+    def __init__(self, canvas, scheduler, budget=PARTICLE_BUDGET, seed=None):
+        self.canvas = canvas
+        self.scheduler = scheduler
+        self.budget = budget
+        self.rng = np.random.default_rng(seed)
+        self.position = np.zeros((budget, 2))
+        self.velocity = np.zeros((budget, 2))
+        self.gravity = np.zeros(budget)
+        self.wobble = np.zeros(budget)
+        self.life = np.zeros(budget)
+        self.items = [None] * budget
+        self.dropped = 0
+        self.steps = 0
+        self._last_step = None
+
+    @property
+    def active(self):
+        return int(np.count_nonzero(self.life > 0))
+
+    def emit(self, x, y, vx, vy, life, glyphs, colors, sizes, gravity=0.0, wobble=0.0):
+        """Add particles; every argument is a scalar or one value per particle.
+
+        Positions are in canvas pixels, velocities in pixels per second,
+        ``gravity`` in pixels per second squared and ``wobble`` is random
+        sideways jitter in pixels per frame. Returns how many were added.
+        """
+        count = len(np.atleast_1d(x))
+        # At reduced quality a random share of the requested particles is kept
+        keep = np.flatnonzero(self.rng.random(count) < self.scheduler.particle_scale)
+        limit = int(self.budget * self.scheduler.particle_scale)
+        free = np.flatnonzero(self.life <= 0)[:max(0, min(len(keep), limit - self.active))]
+        self.dropped += count - len(free)
+        if not len(free):
+            return 0
+        keep = keep[:len(free)]
+
+        def take(value):
+            return np.broadcast_to(value, (count,))[keep]
+
+        self.position[free, 0] = take(x)
+        self.position[free, 1] = take(y)
+        self.velocity[free, 0] = take(vx)
+        self.velocity[free, 1] = take(vy)
+        self.life[free] = take(life)
+        self.gravity[free] = take(gravity)
+        self.wobble[free] = take(wobble)
+        glyphs, colors, sizes = take(glyphs), take(colors), take(sizes)
+
+        for i, slot in enumerate(free):
+            x, y = self.position[slot]
+            options = {'text': glyphs[i], 'fill': colors[i], 'font': (PARTICLE_FONT, int(sizes[i]))}
+            if self.items[slot] is None:
+                self.items[slot] = self.canvas.create_text(x, y, anchor='nw', tags=PARTICLE_TAG, **options)
+            else:
+                self.canvas.coords(self.items[slot], x, y)
+                self.canvas.itemconfigure(self.items[slot], state='normal', **options)
+        # Reused items keep their old stacking position; keep every particle above the screen's own items
+        self.canvas.tag_raise(PARTICLE_TAG)
+        if not self.scheduler.is_running(self):
+            self._last_step = None
+            self.scheduler.add(self, self.step)
+        return len(free)
+
+    def step(self, now):
+        """Advance every live particle to ``now`` and redraw them; False once none are left."""
+        if not self.canvas.winfo_exists():
+            return False
+        if self._last_step is None:
+            dt = self.scheduler.frame_interval
+        else:
+            dt = min(now - self._last_step, MAX_STEP_SECONDS)
+        self._last_step = now
+
+        alive = np.flatnonzero(self.life > 0)
+        limit = int(self.budget * self.scheduler.particle_scale)
+        if len(alive) > limit:
+            self.life[alive[limit:]] = 0
+            for slot in alive[limit:]:
+                self.canvas.itemconfigure(self.items[slot], state='hidden')
+            alive = alive[:limit]
+        self.velocity[alive, 1] += self.gravity[alive] * dt
+        self.position[alive] += self.velocity[alive] * dt
+        self.position[alive, 0] += self.rng.uniform(-1, 1, len(alive)) * self.wobble[alive]
+        self.life[alive] -= dt
+        self.steps += 1
+
+        for slot in alive:
+            if self.life[slot] > 0:
+                self.canvas.coords(self.items[slot], *self.position[slot])
+            else:
+                self.canvas.itemconfigure(self.items[slot], state='hidden')
+        return bool(np.any(self.life > 0))
+
+    def clear(self):
+        """Stop stepping and remove every particle; safe after the canvas is destroyed."""
+        self.scheduler.remove(self)
+        self.life[:] = 0
+        if self.canvas.winfo_exists():
+            for item in self.items:
+                if item is not None:
+                    self.canvas.delete(item)
+        self.items = [None] * self.budget
+
+
+def free_regions(screen_width, screen_height, covered):
+    """The parts of the screen not under any of the ``covered`` boxes ``(x0, y0, x1, y1)``.
+
+    The screen is cut into horizontal bands at the boxes' top and bottom
+    edges; the uncovered stretches of each band are returned as boxes, and a
+    stretch that continues one of the band above extends that box downwards.
+    """
+    boxes = [(max(0, x0), max(0, y0), min(x1, screen_width), min(y1, screen_height)) for x0, y0, x1, y1 in covered]
+    boxes = [box for box in boxes if box[2] > box[0] and box[3] > box[1]]
+    edges = sorted({0, screen_height} | {y for box in boxes for y in (box[1], box[3])})
+    regions = []
+    # (left, right) of each stretch in the band above -> its box in ``regions``
+    above = {}
+    for top, bottom in zip(edges, edges[1:]):
+        stretches = []
+        x = 0
+        for x0, x1 in sorted((box[0], box[2]) for box in boxes if box[1] < bottom and box[3] > top):
+            if x0 > x:
+                stretches.append((x, x0))
+            x = max(x, x1)
+        if x < screen_width:
+            stretches.append((x, screen_width))
+
+        current = {}
+        for left, right in stretches:
+            index = above.get((left, right))
+            if index is None:
+                regions.append((left, top, right, bottom))
+                index = len(regions) - 1
+            else:
+                regions[index] = regions[index][:3] + (bottom,)
+            current[left, right] = index
+        above = current
+    return regions
+
+
+def _glyph_room(regions, size, smallest=0):
+    """Shrink ``regions`` by the glyph ``size`` at the right and bottom (text is anchored top-left).
+
+    Regions left narrower or shorter than ``smallest`` are dropped.
+    """
+    room = [(x0, y0, x1 - size, y1 - size) for x0, y0, x1, y1 in regions]
+    return [box for box in room if box[2] - box[0] > smallest and box[3] - box[1] > smallest]
+
+
+def _sample_points(rng, regions, count, margin):
+    """``count`` random points in ``regions``, each region chosen in proportion to its area.
+
+    Points keep ``margin`` pixels from a region's sides where it is wide
+    enough; the region of each point is returned with it.
+    """
+    regions = np.asarray(regions, dtype=float)
+    areas = (regions[:, 2] - regions[:, 0]) * (regions[:, 3] - regions[:, 1])
+    chosen = regions[rng.choice(len(regions), count, p=areas / areas.sum())]
+    low = np.minimum(chosen[:, :2] + margin, (chosen[:, :2] + chosen[:, 2:]) / 2)
+    high = np.maximum(chosen[:, 2:] - margin, low)
+    return rng.uniform(low, high), chosen
+
+
+def _bursts(system, centres, rays, speed, distance, glyphs, colors, sizes, bounds=None):
+    """Particles flying out from each centre along ``rays`` evenly spaced directions.
+
+    With ``bounds``, one box per burst, a burst travels no further than the
+    nearest side of its box.
+    """
+    centres = np.asarray(centres, dtype=float)
+    count = len(centres) * rays
+    if bounds is not None:
+        bounds = np.asarray(bounds, dtype=float)
+        room = np.minimum(centres - bounds[:, :2], bounds[:, 2:] - centres).min(axis=1)
+        distance = np.minimum(distance, np.repeat(room, rays))
+    angles = np.tile(np.radians(np.arange(rays) * 360 / rays), len(centres))
+    speed = np.broadcast_to(speed, (count,))
+    return system.emit(
+        np.repeat(centres[:, 0], rays), np.repeat(centres[:, 1], rays),
+        speed * np.cos(angles), speed * np.sin(angles),
+        np.broadcast_to(distance, (count,)) / speed,
+        glyphs, colors, sizes
+    )
+
+
+def fireworks(system, screen_width, regions=None):
+    """Eight sparkle bursts across the top of the screen, one colour each, or at random in ``regions``."""
+    colors = np.repeat([SPARKLE_COLORS[burst % len(SPARKLE_COLORS)] for burst in range(8)], 12)
+    if regions is None:
+        centres = [(150 + burst * (screen_width - 300) // 7, 200 + (burst % 2) * 100) for burst in range(8)]
+        return _bursts(system, centres, 12, speed=330.0, distance=100.0, glyphs='✨', colors=colors, sizes=25)
+
+    regions = _glyph_room(regions, 25, 2 * MIN_BURST_RADIUS)
+    if not regions:
+        return 0
+    centres, bounds = _sample_points(system.rng, regions, 8, 100)
+    return _bursts(system, centres, 12, speed=330.0, distance=100.0, glyphs='✨', colors=colors, sizes=25,
+                   bounds=bounds)
+
+
+def firecracker(system, screen_width, screen_height, bursts=30, rays=12, regions=None):
+    """Bursts of mixed glyphs at random places over the screen, or over ``regions`` only."""
+    rng = system.rng
+    count = bursts * rays
+    bounds = None
+    if regions is None:
+        centres, _ = _sample_points(rng, [(0, 0, screen_width, screen_height)], bursts, 50)
+    else:
+        regions = _glyph_room(regions, 40, 2 * MIN_BURST_RADIUS)
+        if not regions:
+            return 0
+        centres, bounds = _sample_points(rng, regions, bursts, 50)
+    return _bursts(
+        system, centres, rays,
+        speed=rng.uniform(200, 375, count),
+        distance=np.repeat(rng.uniform(80, 150, bursts), rays),
+        glyphs=rng.choice(FIRECRACKER_GLYPHS, count),
+        colors=rng.choice(SPARKLE_COLORS[:6], count),
+        sizes=rng.integers(20, 41, count),
+        bounds=bounds
+    )
+
+
+def confetti(system, screen_width, screen_height, pieces=30, duration=3.0, regions=None):
+    """Pieces falling from the top edge, drifting sideways, for at most ``duration`` seconds.
+
+    With ``regions`` each piece falls from the top of one region and is gone
+    by its bottom edge.
+    """
+    rng = system.rng
+    if regions is not None:
+        regions = _glyph_room(regions, 40)
+        if not regions:
+            return 0
+    start, chosen = _sample_points(rng, regions or [(0, 0, screen_width, screen_height)], pieces, 100)
+    top, bottom = chosen[:, 1], chosen[:, 3]
+    y = top + np.minimum(rng.uniform(0, 150, pieces), (bottom - top) / 2)
+    vy = rng.uniform(100, 300, pieces)
+    return system.emit(
+        start[:, 0], y,
+        0.0, vy, np.minimum((bottom - y) / vy, duration),
+        rng.choice(CONFETTI_GLYPHS, pieces), rng.choice(CONFETTI_COLORS, pieces),
+        rng.integers(20, 41, pieces), wobble=5.0
+    )
@@ -0,0 +1,218 @@
+"""Capture and face detection in a separate process.
+
+Haar detection on a thread of the UI process competes with Tk for the GIL.
+``ProctoringWorker`` moves capture, detection and preview rendering into a
+child process: preview frames come back through shared memory
+(``SharedFrameExchange``) and detections, camera health and start-up status
+over a queue. The UI process keeps the presence logic and only has to copy a
+small preview and unpickle a few rectangles.
+
+``ProctoringWorker`` looks like the in-process ``CaptureSupervisor`` to the
+UI (``health``, ``reopens``, ``isOpened``, ``release``) and its ``frames``
+like a ``FrameExchange``. Opening the camera in the child can take seconds,
+so nothing waits for it: the worker is ``starting`` until the child reports,
+and the UI polls ``isOpened`` from a Tk ``after`` callback.
+"""
+import multiprocessing
+import queue
+import time
+from multiprocessing import shared_memory
+
+import cv2
+import numpy as np
+
+from frame_sources import (
+    HEALTH_OFFLINE, HEALTH_OK, HEALTH_STARTING, HEALTH_STOPPED, CaptureSupervisor, open_frame_source
+)
+from proctoring import PREVIEW_SIZE, DetectionScheduler, render_preview
+
+START_TIMEOUT = 10.0
+STOP_TIMEOUT = 3.0
+
+
+class SharedFrameExchange:
+    """Latest-frame hand-off between processes through shared memory.
+
+    Two frame slots are written alternately, each stamped with the sequence
+    number of the frame it holds; a reader copies the newest slot and checks
+    the stamp again afterwards, so it never returns a frame that was being
+    overwritten. Same ``newer_than`` interface as ``FrameExchange``.
+    """
+
+    HEADER_SIZE = 3 * 8
+
+    def __init__(self, shape, name=None):
+        self.shape = tuple(shape)
+        frame_size = int(np.prod(self.shape))
+        self.owner = name is None
+        if self.owner:
+            self.memory = shared_memory.SharedMemory(create=True, size=self.HEADER_SIZE + 2 * frame_size)
+        else:
+            self.memory = shared_memory.SharedMemory(name=name)
+        self.name = self.memory.name
+        buffer = self.memory.buf
+        # [latest sequence, sequence in slot 0, sequence in slot 1]
+        self.header = np.ndarray((3,), dtype=np.int64, buffer=buffer)
+        self.slots = [
+            np.ndarray(self.shape, dtype=np.uint8, buffer=buffer, offset=self.HEADER_SIZE + i * frame_size)
+            for i in range(2)
+        ]
+        if self.owner:
+            self.header[:] = 0
+        self.sequence = int(self.header[0])
+
+    def publish(self, frame):
+        sequence = self.sequence + 1
+        slot = sequence % 2
+        self.header[1 + slot] = 0
+        self.slots[slot][...] = frame
+        self.header[1 + slot] = sequence
+        self.header[0] = sequence
+        self.sequence = sequence
+        return sequence
+
+    def newer_than(self, sequence):
+        latest = int(self.header[0])
+        if latest <= sequence:
+            return None
+        stamp = 1 + latest % 2
+        if self.header[stamp] != latest:
+            return None
+        frame = self.slots[latest % 2].copy()
+        if self.header[stamp] != latest:
+            return None
+        return latest, frame
+
+    def close(self):
+        # Drop the numpy views first; the mapping cannot close while they exist
+        self.header = None
+        self.slots = []
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
+
+
+def run_worker(config, frames_name, frame_shape, results, stop):
+    """Child process: capture, detect and publish until ``stop`` is set."""
+    supervisor = None
+    opened = False
+    try:
+        supervisor = CaptureSupervisor(lambda: open_frame_source(config.source))
+        if not supervisor.isOpened():
+            results.put(('opened', False, "could not access camera"))
+            return
+        detector = config.create_detector()
+        opened = True
+    except Exception as e:
+        results.put(('opened', False, str(e)))
+        return
+    finally:
+        # Hand the device back when the worker gives up before its capture loop
+        if not opened and supervisor is not None:
+            supervisor.release()
+
+    frames = SharedFrameExchange(frame_shape, name=frames_name)
+    results.put(('opened', True, None))
+    # From here on exit without waiting for the parent to drain undelivered results;
+    # a failed start above still flushes its one message so the UI can show why
+    results.cancel_join_thread()
+    scheduler = DetectionScheduler(config.detection_rate)
+    gate = config.create_motion_gate()
+    faces, face_eyes = [], []
+    health = None
+    try:
+        while not stop.is_set():
+            ok, frame = supervisor.read()
+            if supervisor.health != health:
+                health = supervisor.health
+                results.put(('health', health, supervisor.reopens))
+            if not ok:
+                continue
+
+            frame = cv2.flip(frame, 1)
+            now = time.monotonic()
+            if scheduler.due(now):
+                if gate.should_detect(frame, now):
+                    faces, face_eyes = detector.detect(frame)
+                frame_size = (frame.shape[1], frame.shape[0])
+                results.put(('detection', faces, face_eyes, now, frame_size, gate.skip_ratio))
+            frames.publish(render_preview(frame, faces, face_eyes))
+    finally:
+        supervisor.release()
+        frames.close()
+
+
+class ProctoringWorker:
+    """UI-side handle on the proctoring process."""
+
+    def __init__(self, config, preview_size=PREVIEW_SIZE):
+        context = multiprocessing.get_context('spawn')
+        width, height = preview_size
+        self.frames = SharedFrameExchange((height, width, 3))
+        self.results = context.Queue()
+        self._stop = context.Event()
+        self.process = context.Process(
+            target=run_worker,
+            args=(config, self.frames.name, self.frames.shape, self.results, self._stop),
+            daemon=True
+        )
+        self.health = HEALTH_STARTING
+        self.reopens = 0
+        self.skip_ratio = 0.0
+        self.error = None
+        self._opened = None
+        self._start_deadline = time.monotonic() + START_TIMEOUT
+        self.process.start()
+
+    @property
+    def starting(self):
+        """True until the worker has reported whether it opened the camera."""
+        return self._opened is None
+
+    def isOpened(self):
+        """Whether the worker has opened the camera; never blocks.
+
+        While ``starting`` this checks for the worker's report and returns
+        False; a worker that has not reported within ``START_TIMEOUT``, or
+        has exited, counts as failed.
+        """
+        if self._opened is None:
+            try:
+                message = self.results.get_nowait()
+            except (queue.Empty, OSError, ValueError):
+                if self.process.is_alive() and time.monotonic() < self._start_deadline:
+                    return False
+                message = ('opened', False, "proctoring process did not start")
+            _, self._opened, self.error = message
+            self.health = HEALTH_OK if self._opened else HEALTH_OFFLINE
+        return self._opened
+
+    def next_detection(self, timeout=0.5):
+        """The next ``(faces, face_eyes, timestamp, frame_size)``, or None if none arrived in time.
+
+        Health updates are applied as they pass through.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            try:
+                message = self.results.get(timeout=remaining)
+            except (queue.Empty, OSError, ValueError):
+                return None
+            if message[0] == 'detection':
+                self.skip_ratio = message[5]
+                return message[1:5]
+            if message[0] == 'health':
+                self.health, self.reopens = message[1], message[2]
+
+    def release(self):
+        self._stop.set()
+        self.health = HEALTH_STOPPED
+        self.process.join(STOP_TIMEOUT)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join()
+        self.results.close()
+        self.frames.close()
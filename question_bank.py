@@ -0,0 +1,584 @@
+"""Question bank loading and on-disk caching for the Brain Buster quiz."""
+import base64
+import codecs
+import csv
+import io
+import json
+import os
+import tempfile
+import time
+from array import array
+from io import StringIO
+
+import requests
+
+from question_index import QuestionIndex
+
+SHEET_ID = "1xKbWWQ39_q6aR17uy9xZMi0HaDnt38TCflwgS2UB4Kc"
+SHEET_URL_ENV = "BRAIN_BUSTER_SHEET_URL"
+SHEET_CSV_URL = f"https://docs.google.com/spreadsheets/d/{SHEET_ID}/export?format=csv"
+
+CACHE_VERSION = 7
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "brain_buster", "question_bank.json"
+)
+# A cached bank younger than this is served without touching the network
+DEFAULT_MAX_AGE = 15 * 60
+# Number of streamed questions after which on_ready lets the quiz start early
+DEFAULT_READY_COUNT = 50
+
+OPTION_COLUMNS = ('Option A', 'Option B', 'Option C', 'Option D')
+ANSWER_LETTERS = ('A', 'B', 'C', 'D')
+# Strings up to this length are de-duplicated in the store ("True", "206", ...)
+INTERN_MAX_LENGTH = 32
+
+DEFAULT_QUESTIONS = [
+    {
+        'question': "How many elements are in periodic table?",
+        'options': ["116", "117", "118", "119"],
+        'correct_answer': "C"
+    },
+    {
+        'question': "Which is the most abundant gas in the atmosphere?",
+        'options': ["Nitrogen", "Oxygen", "CO2", "Hydrogen"],
+        'correct_answer': "A"
+    },
+    {
+        'question': "Which animal lays the largest eggs?",
+        'options': ["Whale", "Crocodile", "Elephant", "Ostrich"],
+        'correct_answer': "D"
+    },
+    {
+        'question': "How many bones are in the human body?",
+        'options': ["206", "207", "208", "204"],
+        'correct_answer': "A"
+    },
+    {
+        'question': "Which is the hottest planet in our solar system?",
+        'options': ["Mercury", "Venus", "Earth", "Mars"],
+        'correct_answer': "B"
+    }
+]
+
+
+def resolve_answer_index(correct_answer, options):
+    """Map a sheet answer (a letter or the option text) to an option index, or None."""
+    answer = correct_answer.strip()
+    if answer in ANSWER_LETTERS:
+        return ANSWER_LETTERS.index(answer)
+
+    stripped = [option.strip() for option in options]
+    if answer in stripped:
+        return stripped.index(answer)
+
+    if answer.upper() in ANSWER_LETTERS:
+        return ANSWER_LETTERS.index(answer.upper())
+
+    folded = [option.casefold() for option in stripped]
+    if answer.casefold() in folded:
+        return folded.index(answer.casefold())
+    return None
+
+
+def split_tags(text):
+    """Split a comma-separated Tags cell into normalised, de-duplicated tags."""
+    tags = []
+    for tag in text.split(','):
+        tag = tag.strip().lower()
+        if tag and tag not in tags:
+            tags.append(tag)
+    return tags
+
+
+def row_to_question(row):
+    """Validate one CSV row.
+
+    Returns ``(question, None)`` for a usable row, where the question's
+    ``answer_index`` is already resolved, or ``(None, reason)`` otherwise.
+    """
+    question = (row.get('Question') or '').strip()
+    options = [row.get(column) or '' for column in OPTION_COLUMNS]
+    correct_answer = (row.get('Correct Answer') or '').strip()
+
+    if not question:
+        return None, "missing question"
+    for letter, option in zip(ANSWER_LETTERS, options):
+        if not option.strip():
+            return None, f"missing option {letter}"
+    if not correct_answer:
+        return None, "missing correct answer"
+
+    answer_index = resolve_answer_index(correct_answer, options)
+    if answer_index is None:
+        return None, f"correct answer {correct_answer!r} matches no option"
+
+    return {
+        'question': row['Question'],
+        'options': options,
+        'answer_index': answer_index,
+        'category': (row.get('Category') or '').strip(),
+        'difficulty': (row.get('Difficulty') or '').strip(),
+        'tags': split_tags(row.get('Tags') or '')
+    }, None
+
+
+def iter_questions(lines, invalid_rows=None):
+    """Yield valid questions from an iterable of CSV lines without buffering the sheet.
+
+    Rejected rows are appended to ``invalid_rows`` as ``(sheet_row, reason)``.
+    ``sheet_row`` is the row number the spreadsheet shows: records are
+    counted, so a cell with line breaks does not shift the rows after it
+    the way ``reader.line_num`` (a count of CSV lines) would.
+    """
+    # Row 1 of the sheet is the header
+    for sheet_row, row in enumerate(csv.DictReader(lines), start=2):
+        question, reason = row_to_question(row)
+        if question is not None:
+            yield question
+        elif invalid_rows is not None and any((value or '').strip() for value in row.values()
+                                               if isinstance(value, str)):
+            invalid_rows.append((sheet_row, reason))
+
+
+def parse_questions(text):
+    """Parse the sheet's CSV export into a QuestionStore."""
+    questions = QuestionStore()
+    for question in iter_questions(StringIO(text), questions.invalid_rows):
+        questions.append(**question)
+    questions.freeze()
+    if not questions:
+        raise ValueError("sheet contains no questions")
+    return questions
+
+
+def iter_response_lines(response):
+    """Decode a streamed CSV response into lines that keep their original terminators.
+
+    The text is read straight from the (decompressed) raw stream with
+    ``newline=''``, as the csv module expects, so a ``\r\n`` inside a quoted
+    field reaches the reader unchanged wherever the chunk boundaries fall.
+    """
+    encoding = response.encoding if 'charset' in response.headers.get('Content-Type', '') else 'utf-8'
+    if codecs.lookup(encoding).name == 'utf-8':
+        # Drops the byte order mark Google Sheets exports sometimes start with
+        encoding = 'utf-8-sig'
+    response.raw.decode_content = True
+    # Otherwise urllib3 closes the stream at EOF and TextIOWrapper fails on its last read
+    response.raw.auto_close = False
+    return io.TextIOWrapper(response.raw, encoding=encoding, newline='')
+
+
+class LabelColumn:
+    """A short per-question label (category, difficulty) stored as integer codes."""
+
+    def __init__(self, labels=('',)):
+        self.labels = list(labels)
+        self._codes_by_label = {label: code for code, label in enumerate(self.labels)}
+        # 32-bit codes: category is free text, so a large sheet can exceed 65,535 labels
+        self.codes = array('I')
+
+    @classmethod
+    def from_state(cls, state):
+        column = cls(state['labels'])
+        column.codes.frombytes(base64.b64decode(state['codes']))
+        return column
+
+    def to_state(self):
+        return {
+            'labels': self.labels,
+            'codes': base64.b64encode(self.codes.tobytes()).decode('ascii')
+        }
+
+    def append(self, label):
+        code = self._codes_by_label.get(label)
+        if code is None:
+            code = len(self.labels)
+            self.labels.append(label)
+            self._codes_by_label[label] = code
+        self.codes.append(code)
+
+    def code(self, label):
+        """Return the code for ``label`` or None if no question carries it."""
+        return self._codes_by_label.get(label)
+
+    def label(self, index):
+        return self.labels[self.codes[index]]
+
+    def copy(self):
+        column = LabelColumn(self.labels)
+        column.codes = array('I', self.codes)
+        return column
+
+
+class TagColumn:
+    """Zero or more tags per question, stored as codes with per-question offsets."""
+
+    def __init__(self, labels=()):
+        self.labels = list(labels)
+        self._codes_by_label = {label: code for code, label in enumerate(self.labels)}
+        # 32-bit codes: a large sheet can carry more than 65,535 distinct tags
+        self.codes = array('I')
+        self.offsets = array('I', [0])
+
+    @classmethod
+    def from_state(cls, state):
+        column = cls(state['labels'])
+        column.codes.frombytes(base64.b64decode(state['codes']))
+        column.offsets = array('I')
+        column.offsets.frombytes(base64.b64decode(state['offsets']))
+        return column
+
+    def to_state(self):
+        return {
+            'labels': self.labels,
+            'codes': base64.b64encode(self.codes.tobytes()).decode('ascii'),
+            'offsets': base64.b64encode(self.offsets.tobytes()).decode('ascii')
+        }
+
+    def append(self, tags):
+        for tag in tags:
+            code = self._codes_by_label.get(tag)
+            if code is None:
+                code = len(self.labels)
+                self.labels.append(tag)
+                self._codes_by_label[tag] = code
+            self.codes.append(code)
+        self.offsets.append(len(self.codes))
+
+    def code(self, label):
+        return self._codes_by_label.get(label)
+
+    def question_codes(self, index):
+        return self.codes[self.offsets[index]:self.offsets[index + 1]]
+
+    def tags(self, index):
+        return tuple(self.labels[code] for code in self.question_codes(index))
+
+    def copy(self):
+        column = TagColumn(self.labels)
+        column.codes = array('I', self.codes)
+        column.offsets = array('I', self.offsets)
+        return column
+
+
+class QuestionStore:
+    """Compact, append-only question bank.
+
+    All text lives in a single string buffer and every question is a fixed
+    row of (start, end) offsets into it: the question and the four options.
+    Short repeated strings are stored once. The correct answer is resolved to
+    an option index at ingest and kept in a byte array, so selecting and
+    grading questions never touches the answer text again. Compared with a
+    list of dicts this saves the per-row dict, list and string headers.
+
+    Optional ``Category``, ``Difficulty`` and comma-separated ``Tags``
+    columns are kept as integer coded labels. Rows rejected while loading are kept in ``invalid_rows``
+    as ``(sheet_row, reason)`` pairs.
+    """
+
+    FIELDS = 5
+
+    def __init__(self):
+        self._buffer = ''
+        self._pending = []
+        self._pending_length = 0
+        self._spans = array('I')
+        self._answers = array('b')
+        self._interned = {}
+        self._strata = None
+        self._index = None
+        self.categories = LabelColumn()
+        self.difficulties = LabelColumn()
+        self.tag_column = TagColumn()
+        self.invalid_rows = []
+
+    @classmethod
+    def from_dicts(cls, questions):
+        """Build a store from dicts with ``question``, ``options`` and ``correct_answer``."""
+        store = cls()
+        for q in questions:
+            answer_index = resolve_answer_index(q['correct_answer'], q['options'])
+            if answer_index is None:
+                raise ValueError(f"correct answer {q['correct_answer']!r} matches no option")
+            store.append(q['question'], q['options'], answer_index,
+                         q.get('category', ''), q.get('difficulty', ''), q.get('tags', ()))
+        return store
+
+    @classmethod
+    def from_state(cls, state):
+        store = cls()
+        store._buffer = state['buffer']
+        store._spans.frombytes(base64.b64decode(state['spans']))
+        store._answers.frombytes(base64.b64decode(state['answers']))
+        store.categories = LabelColumn.from_state(state['categories'])
+        store.difficulties = LabelColumn.from_state(state['difficulties'])
+        store.tag_column = TagColumn.from_state(state['tags'])
+        store.invalid_rows = [tuple(row) for row in state['invalid_rows']]
+        count = len(store._answers)
+        if (len(store._spans) != count * store.FIELDS * 2 or len(store.categories.codes) != count
+                or len(store.difficulties.codes) != count or len(store.tag_column.offsets) != count + 1):
+            raise ValueError("corrupt question store")
+        return store
+
+    def to_state(self):
+        """Return a JSON-serialisable snapshot of the store."""
+        self.freeze()
+        return {
+            'buffer': self._buffer,
+            'spans': base64.b64encode(self._spans.tobytes()).decode('ascii'),
+            'answers': base64.b64encode(self._answers.tobytes()).decode('ascii'),
+            'categories': self.categories.to_state(),
+            'difficulties': self.difficulties.to_state(),
+            'tags': self.tag_column.to_state(),
+            'invalid_rows': self.invalid_rows
+        }
+
+    def append(self, question, options, answer_index, category='', difficulty='', tags=()):
+        for text in (question, options[0], options[1], options[2], options[3]):
+            self._spans.extend(self._add_text(text))
+        self._answers.append(answer_index)
+        self.categories.append(category)
+        self.difficulties.append(difficulty)
+        self.tag_column.append(tags)
+        self._strata = None
+        self._index = None
+
+    def _add_text(self, text):
+        span = self._interned.get(text)
+        if span is not None:
+            return span
+
+        start = len(self._buffer) + self._pending_length
+        self._pending.append(text)
+        self._pending_length += len(text)
+        span = (start, start + len(text))
+        if len(text) <= INTERN_MAX_LENGTH:
+            self._interned[text] = span
+        return span
+
+    def _flush(self):
+        if self._pending:
+            self._buffer += ''.join(self._pending)
+            self._pending = []
+            self._pending_length = 0
+
+    def freeze(self):
+        """Join pending text into the buffer and drop the intern table."""
+        self._flush()
+        self._interned = {}
+
+    def copy(self):
+        self._flush()
+        store = QuestionStore()
+        store._buffer = self._buffer
+        store._spans = array('I', self._spans)
+        store._answers = array('b', self._answers)
+        store.categories = self.categories.copy()
+        store.difficulties = self.difficulties.copy()
+        store.tag_column = self.tag_column.copy()
+        store.invalid_rows = list(self.invalid_rows)
+        return store
+
+    def _text(self, index, field):
+        self._flush()
+        offset = (index * self.FIELDS + field) * 2
+        return self._buffer[self._spans[offset]:self._spans[offset + 1]]
+
+    def question(self, index):
+        return self._text(index, 0)
+
+    def options(self, index):
+        return tuple(self._text(index, field) for field in range(1, 5))
+
+    def answer_index(self, index):
+        return self._answers[index]
+
+    def answer_letter(self, index):
+        return ANSWER_LETTERS[self._answers[index]]
+
+    def category(self, index):
+        return self.categories.label(index)
+
+    def difficulty(self, index):
+        return self.difficulties.label(index)
+
+    def tags(self, index):
+        return self.tag_column.tags(index)
+
+    def strata(self):
+        """Question indexes grouped by ``(category_code, difficulty_code)``, built once."""
+        if self._strata is None:
+            strata = {}
+            for index, key in enumerate(zip(self.categories.codes, self.difficulties.codes)):
+                members = strata.get(key)
+                if members is None:
+                    members = strata[key] = array('I')
+                members.append(index)
+            self._strata = strata
+        return self._strata
+
+    def question_index(self):
+        """The QuestionIndex over this store, built once; the loaders build it on their thread."""
+        if self._index is None:
+            self._index = QuestionIndex(self)
+        return self._index
+
+    def validation_report(self):
+        """Describe the sheet rows that were skipped while loading."""
+        if not self.invalid_rows:
+            return "All rows are valid."
+        lines = [f"{len(self.invalid_rows)} row(s) skipped:"]
+        lines.extend(f"  row {sheet_row}: {reason}" for sheet_row, reason in self.invalid_rows)
+        return "\n".join(lines)
+
+    def __len__(self):
+        return len(self._answers)
+
+    def __getitem__(self, index):
+        if not -len(self) <= index < len(self):
+            raise IndexError("question index out of range")
+        index %= len(self)
+        return {
+            'question': self.question(index),
+            'options': list(self.options(index)),
+            'correct_answer': self.answer_letter(index),
+            'category': self.category(index),
+            'difficulty': self.difficulty(index),
+            'tags': list(self.tags(index))
+        }
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+
+class QuestionBankCache:
+    """Parsed question bank persisted to disk together with its HTTP validators."""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH):
+        self.path = path
+
+    def load(self, url):
+        """Return the cached entry for ``url`` or None if missing, stale-format or unreadable."""
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if entry.get('version') != CACHE_VERSION or entry.get('url') != url:
+            return None
+        try:
+            entry['questions'] = QuestionStore.from_state(entry['questions'])
+        except (KeyError, TypeError, ValueError):
+            return None
+        if not entry['questions']:
+            return None
+        return entry
+
+    def save(self, url, questions, etag=None, last_modified=None):
+        entry = {
+            'version': CACHE_VERSION,
+            'url': url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'fetched_at': time.time(),
+            'questions': questions
+        }
+        self._write(entry)
+        return entry
+
+    def touch(self, entry):
+        """Mark ``entry`` as freshly revalidated."""
+        entry['fetched_at'] = time.time()
+        self._write(entry)
+
+    def _write(self, entry):
+        directory = os.path.dirname(self.path) or '.'
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                # json.dumps uses the C encoder; json.dump to a file does not
+                f.write(json.dumps(dict(entry, questions=entry['questions'].to_state())))
+            os.replace(tmp_path, self.path)
+        except OSError:
+            # A read-only home directory must not break the quiz
+            pass
+
+
+def sheet_csv_url():
+    """The sheet export URL: ``BRAIN_BUSTER_SHEET_URL`` if set, read at call time."""
+    return os.environ.get(SHEET_URL_ENV) or SHEET_CSV_URL
+
+
+def load_question_bank(url=None, cache=None, max_age=DEFAULT_MAX_AGE, timeout=10,
+                       on_ready=None, ready_count=DEFAULT_READY_COUNT):
+    """Load the question bank, preferring the on-disk cache.
+
+    A cache entry younger than ``max_age`` seconds is returned without any
+    network access. Older entries are revalidated with a conditional GET, so
+    an unchanged sheet costs a single 304 response. If the network fails a
+    stale entry is still served; with no cache at all the error propagates.
+
+    Downloads are streamed and parsed row by row. Once ``ready_count`` valid
+    questions have arrived, ``on_ready`` is called with a copy of them so the
+    caller can start a quiz before the rest of the sheet has been read.
+
+    ``url`` defaults to ``sheet_csv_url()``. Returns a ``(questions, source)``
+    tuple where ``questions`` is a QuestionStore and ``source`` is one of
+    ``"cache"``, ``"revalidated"``, ``"network"`` or ``"stale"``.
+    """
+    if url is None:
+        url = sheet_csv_url()
+    if cache is None:
+        cache = QuestionBankCache()
+
+    entry = cache.load(url)
+    if entry is not None and time.time() - entry.get('fetched_at', 0) < max_age:
+        return entry['questions'], "cache"
+
+    headers = {}
+    if entry is not None:
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+
+    try:
+        with requests.get(url, headers=headers, timeout=timeout, stream=True) as response:
+            if response.status_code == 304 and entry is not None:
+                cache.touch(entry)
+                return entry['questions'], "revalidated"
+            response.raise_for_status()
+
+            questions = QuestionStore()
+            for question in iter_questions(iter_response_lines(response), questions.invalid_rows):
+                questions.append(**question)
+                if on_ready is not None and len(questions) == ready_count:
+                    on_ready(questions.copy())
+            questions.freeze()
+
+            if not questions:
+                raise ValueError("sheet contains no questions")
+    except (requests.RequestException, ValueError, csv.Error):
+        if entry is not None:
+            return entry['questions'], "stale"
+        raise
+
+    cache.save(
+        url,
+        questions,
+        etag=response.headers.get('ETag'),
+        last_modified=response.headers.get('Last-Modified')
+    )
+    return questions, "network"
+
+
+if __name__ == "__main__":
+    import sys
+
+    # Print the validation report for the configured sheet (or a URL given on the command line)
+    bank, source = load_question_bank(sys.argv[1] if len(sys.argv) > 1 else None, max_age=0)
+    print(f"Loaded {len(bank)} questions ({source})")
+    print(bank.validation_report())
@@ -0,0 +1,160 @@
+"""In-memory inverted indexes over a QuestionStore.
+
+Every postings list is an ``array('I')`` of question indexes in ascending
+order, so lookups are a dict access and filters combine by intersecting the
+shortest list against the others with a vectorised binary search.
+"""
+import re
+from array import array
+
+import numpy as np
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+EMPTY_POSTINGS = array('I')
+
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(text.casefold())
+
+
+def _as_numpy(postings):
+    if isinstance(postings, np.ndarray):
+        return postings
+    return np.frombuffer(postings, dtype=np.uint32)
+
+
+def _as_postings(values):
+    postings = array('I')
+    postings.frombytes(values.astype(np.uint32).tobytes())
+    return postings
+
+
+def intersect(postings):
+    """Indexes present in every sorted postings list.
+
+    Starting from the shortest list, each other list is scattered into a
+    boolean mask and the survivors gathered from it, so the cost is linear
+    in the list lengths and runs in C rather than a Python loop.
+    """
+    postings = sorted(postings, key=len)
+    result = _as_numpy(postings[0])
+    for other in postings[1:]:
+        if not len(result):
+            break
+        other = _as_numpy(other)
+        if not len(other):
+            return array('I')
+        mask = np.zeros(max(int(other[-1]), int(result[-1])) + 1, dtype=bool)
+        mask[other] = True
+        result = result[mask[result]]
+    return _as_postings(result)
+
+
+class QuestionIndex:
+    """Category, difficulty, tag and full-text lookup for a QuestionStore.
+
+    Label and tag postings are built up front with a stable sort of the
+    integer-coded columns; build the index off the UI thread (the loaders
+    use ``QuestionStore.question_index``). The columns are copied, so the
+    store can still be appended to, but the index then describes the store
+    as it was. The word index over question and option text is built on the
+    first ``search``, since the quiz itself never needs it.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._category_codes = np.array(store.categories.codes, dtype=np.uint32)
+        self._difficulty_codes = np.array(store.difficulties.codes, dtype=np.uint32)
+        questions = np.arange(len(self._category_codes))
+        self._categories = self._group(self._category_codes, questions, len(store.categories.labels))
+        self._difficulties = self._group(self._difficulty_codes, questions, len(store.difficulties.labels))
+
+        column = store.tag_column
+        offsets = np.array(column.offsets, dtype=np.int64)
+        # The question each tag code belongs to
+        owners = np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+        self._tags = self._group(np.array(column.codes, dtype=np.uint32), owners, len(column.labels))
+        self._words = None
+
+    @staticmethod
+    def _group(codes, owners, label_count):
+        """Postings per code: the ``owners`` entries carrying each code, in ascending order."""
+        order = np.argsort(codes, kind='stable')
+        bounds = np.searchsorted(codes[order], np.arange(label_count + 1))
+        owners = owners[order]
+        return [_as_postings(owners[bounds[code]:bounds[code + 1]]) for code in range(label_count)]
+
+    def _build_words(self):
+        words = {}
+        store = self.store
+        for index in range(len(store)):
+            text = " ".join((store.question(index),) + store.options(index))
+            for word in set(tokenize(text)):
+                postings = words.get(word)
+                if postings is None:
+                    postings = words[word] = array('I')
+                postings.append(index)
+        self._words = words
+
+    def by_category(self, category):
+        code = self.store.categories.code(category)
+        return EMPTY_POSTINGS if code is None else self._categories[code]
+
+    def by_difficulty(self, difficulty):
+        code = self.store.difficulties.code(difficulty)
+        return EMPTY_POSTINGS if code is None else self._difficulties[code]
+
+    def by_tag(self, tag):
+        code = self.store.tag_column.code(tag.strip().lower())
+        return EMPTY_POSTINGS if code is None else self._tags[code]
+
+    def search(self, text):
+        """Questions whose question or option text contains every word of ``text``."""
+        if self._words is None:
+            self._build_words()
+        words = set(tokenize(text))
+        if not words:
+            return array('I')
+        return intersect([self._words.get(word, EMPTY_POSTINGS) for word in words])
+
+    def find(self, categories=None, difficulties=None, tags=None, text=None):
+        """Questions matching all given filters.
+
+        Within ``categories`` or ``difficulties`` any label matches; every tag
+        in ``tags`` must be present. With no filters every question matches.
+        """
+        store = self.store
+        label_filters = []
+        if categories is not None:
+            label_filters.append((self._category_codes, self._wanted(store.categories, categories)))
+        if difficulties is not None:
+            label_filters.append((self._difficulty_codes, self._wanted(store.difficulties, difficulties)))
+
+        postings = [self.by_tag(tag) for tag in tags or ()]
+        if text:
+            postings.append(self.search(text))
+
+        if postings:
+            # Sparse filters first, then check labels only for the survivors
+            result = _as_numpy(intersect(postings))
+            for codes, wanted in label_filters:
+                result = result[wanted[codes[result]]]
+            return _as_postings(result)
+
+        if not label_filters:
+            return array('I', range(len(store)))
+        mask = np.ones(len(store), dtype=bool)
+        for codes, wanted in label_filters:
+            mask &= wanted[codes]
+        return _as_postings(np.flatnonzero(mask))
+
+    @staticmethod
+    def _wanted(column, labels):
+        """Boolean lookup table over label codes, true for the requested labels."""
+        wanted = np.zeros(len(column.labels), dtype=bool)
+        for label in labels:
+            code = column.code(label)
+            if code is not None:
+                wanted[code] = True
+        return wanted
@@ -1,19 +1,44 @@
 import tkinter as tk
 from tkinter import messagebox
-from PIL import Image, ImageTk, ImageDraw, ImageFont
+from PIL import Image, ImageTk, ImageFont
 import io
 from datetime import datetime
 import random
 import cv2
 import threading
+import time
+import queue
+from functools import lru_cache
 import numpy as np
-import requests
-import csv
-from io import StringIO
+from frame_sources import DEFAULT_SOURCE, HEALTH_DEGRADED, HEALTH_OFFLINE, HEALTH_STARTING, CaptureSupervisor, FrameExchange, open_frame_source
+from proctoring import DEFAULT_DETECTION_RATE, DETECTORS, PREVIEW_SIZE, DetectionScheduler, ProctoringConfig, render_preview
+from proctoring_worker import ProctoringWorker
+from particles import ParticleSystem, confetti, firecracker, fireworks, free_regions
+from animation import AnimationScheduler
+from timers import TimerRegistry
+from question_bank import DEFAULT_QUESTIONS, QuestionStore, load_question_bank
+from quiz_engine import QuizEngine
+
+# Background gradient, top row to bottom row
+GRADIENT_TOP = (26, 26, 46)
+GRADIENT_BOTTOM = (128, 0, 128)
+# How often the Tk thread checks whether the proctoring process has opened the camera
+CAMERA_START_POLL_MS = 100
+
+
+@lru_cache(maxsize=4)
+def render_gradient(width, height, top=GRADIENT_TOP, bottom=GRADIENT_BOTTOM):
+    """Vertical gradient image; callers share the cached image and must not draw on it."""
+    fraction = np.arange(height)[:, None] / height
+    column = (np.array(top) + (np.array(bottom) - np.array(top)) * fraction).astype(np.uint8)
+    # One pixel wide, stretched sideways: every row is a single colour
+    return Image.fromarray(column[:, None, :]).resize((width, height), Image.NEAREST)
+
 
 class QuizGame:
-    def __init__(self, root):
+    def __init__(self, root, proctoring_config=None):
         self.root = root
+        self.proctoring_config = proctoring_config or ProctoringConfig()
         self.root.title("Brain Buster Quiz Game")
         
         # Set fullscreen mode
@@ -33,6 +58,12 @@ class QuizGame:
         self.root.bind('<F11>', lambda e: self.toggle_fullscreen())
         
         # Create gradient background
+        self.bg_image = None
+        self.bg_image_key = None
+        # Callbacks of the current screen; cancelled together on every screen change
+        self.timers = TimerRegistry(self.root)
+        self.animations = AnimationScheduler(self.root)
+        self.particles = None
         self.create_gradient_background()
         
         # Motivational quotes
@@ -49,20 +80,13 @@ class QuizGame:
             "Dream bigger. Do bigger."
         ]
         
-        # Load questions from Google Sheet
-        self.all_questions = []
-        self.load_questions_from_sheet()
+        # Questions are loaded in the background once the window is up
+        self.all_questions = QuestionStore()
+        self.question_loader = None
+        self.question_load_queue = queue.Queue()
         
-        # Quiz data - will be populated with random selection
-        self.questions = ()
-        self.options = ()
-        self.answers = ()
-        self.select_random_questions()
-        
-        self.guesses = []
-        self.skipped_questions = []
-        self.score = 0
-        self.question_num = 0
+        # Quiz state and scoring live in the engine; this class only renders it
+        self.engine = QuizEngine(self.all_questions)
         
         # Eye tracking variables
         self.eye_tracking_active = False
@@ -72,14 +96,17 @@ class QuizGame:
         # Camera and face tracking
         self.camera_active = False
         self.cap = None
-        self.face_cascade = None
-        self.eye_cascade = None
-        self.camera_frame = None
+        self.face_detector = None
+        self.motion_gate = None
+        # Latest preview-sized RGB frame from the capture thread; the preview only redraws on a new sequence
+        self.frame_exchange = FrameExchange()
+        self.preview_sequence = 0
         self.face_detected = True
         self.eyes_looking_away = False
-        self.looking_away_count = 0
-        self.body_movement_warnings = 0
-        self.last_face_position = None
+        self.face_missing_since = None
+        self.face_tracker = self.proctoring_config.create_tracker()
+        self.movement_seconds = 0.0
+        self.last_presence_time = None
         self.monitoring = False
         
         # Initialize camera
@@ -87,110 +114,147 @@ class QuizGame:
         
         # Create UI elements
         self.create_widgets()
-        self.display_question()
         self.update_datetime()
         self.start_eye_tracking()
         self.start_camera_monitoring()
+        self.load_questions_from_sheet()
+    
+    # Read-only views of the engine's state for the rendering code
+    @property
+    def questions(self):
+        return self.engine.questions
+    
+    @property
+    def options(self):
+        return self.engine.options
+    
+    @property
+    def answers(self):
+        return self.engine.answers
+    
+    @property
+    def guesses(self):
+        return self.engine.guesses
+    
+    @property
+    def skipped_questions(self):
+        return self.engine.skipped_questions
+    
+    @property
+    def score(self):
+        return self.engine.score
+    
+    @property
+    def question_num(self):
+        return self.engine.question_num
     
     def load_questions_from_sheet(self):
-       
+        """Fetch the question bank on a worker thread so the window paints immediately"""
+        self.question_loader = threading.Thread(target=self.fetch_questions, daemon=True)
+        self.question_loader.start()
+        self.root.after(50, self.poll_question_loader)
+    
+    def fetch_questions(self):
+        
+        # Runs on the loader thread - only hands results to the Tk thread via the queue
+        def on_ready(first_questions):
+            first_questions.strata()
+            first_questions.question_index()
+            self.question_load_queue.put(("partial", first_questions, None, None))
+        
         try:
-            # Google Sheets CSV export URL
-            sheet_id = "1xKbWWQ39_q6aR17uy9xZMi0HaDnt38TCflwgS2UB4Kc"
-            csv_url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/export?format=csv"
-            
-            response = requests.get(csv_url, timeout=10)
-            response.raise_for_status()
-            
-            # Parse CSV
-            csv_reader = csv.DictReader(StringIO(response.text))
-            
-            for row in csv_reader:
-                if row.get('Question') and row.get('Option A'):
-                    question_data = {
-                        'question': row['Question'],
-                        'options': [
-                            row['Option A'],
-                            row['Option B'],
-                            row['Option C'],
-                            row['Option D']
-                        ],
-                        'correct_answer': row['Correct Answer'].strip()
-                    }
-                    self.all_questions.append(question_data)
-            
-            messagebox.showinfo("Success", f"Loaded {len(self.all_questions)} questions from sheet!")
-            
+            questions, source = load_question_bank(on_ready=on_ready)
+            # Build the sampling strata and lookup index here rather than on the Tk thread
+            questions.strata()
+            questions.question_index()
+            self.question_load_queue.put(("done", questions, source, None))
         except Exception as e:
-            messagebox.showwarning("Load Error", f"Could not load questions from sheet: {e}\nUsing default questions.")
-            # Fallback to default questions
-            self.all_questions = [
-                {
-                    'question': "How many elements are in periodic table?",
-                    'options': ["116", "117", "118", "119"],
-                    'correct_answer': "C"
-                },
-                {
-                    'question': "Which is the most abundant gas in the atmosphere?",
-                    'options': ["Nitrogen", "Oxygen", "CO2", "Hydrogen"],
-                    'correct_answer': "A"
-                },
-                {
-                    'question': "Which animal lays the largest eggs?",
-                    'options': ["Whale", "Crocodile", "Elephant", "Ostrich"],
-                    'correct_answer': "D"
-                },
-                {
-                    'question': "How many bones are in the human body?",
-                    'options': ["206", "207", "208", "204"],
-                    'correct_answer': "A"
-                },
-                {
-                    'question': "Which is the hottest planet in our solar system?",
-                    'options': ["Mercury", "Venus", "Earth", "Mars"],
-                    'correct_answer': "B"
-                }
-            ]
+            self.question_load_queue.put(("done", None, None, e))
     
-    def select_random_questions(self, num_questions=5):
-       
-        if len(self.all_questions) < num_questions:
-            num_questions = len(self.all_questions)
+    def poll_question_loader(self):
+        
+        try:
+            kind, questions, source, error = self.question_load_queue.get_nowait()
+        except queue.Empty:
+            self.root.after(50, self.poll_question_loader)
+            return
+        
+        if kind == "partial":
+            # Enough of a large sheet has streamed in to start; keep polling for the rest
+            self.set_question_bank(questions)
+            self.start_loaded_quiz()
+            self.root.after(50, self.poll_question_loader)
+        else:
+            self.on_questions_loaded(questions, source, error)
+    
+    def on_questions_loaded(self, questions, source, error):
         
-        selected = random.sample(self.all_questions, num_questions)
+        if self.all_questions:
+            # The quiz already started on the first streamed questions - swap in the
+            # full bank for later rounds, and never pop a dialog mid-question
+            if error is None:
+                self.set_question_bank(questions)
+            return
+        
+        if error is not None:
+            messagebox.showwarning("Load Error", f"Could not load questions from sheet: {error}\nUsing default questions.")
+            # Fallback to default questions
+            questions = QuestionStore.from_dicts(DEFAULT_QUESTIONS)
+        elif source == "stale":
+            messagebox.showwarning(
+                "Offline",
+                f"Could not reach the question sheet.\nUsing {len(questions)} cached questions."
+            )
         
-        self.questions = tuple(q['question'] for q in selected)
-        self.options = tuple(tuple(q['options']) for q in selected)
+        self.set_question_bank(questions)
+        self.start_loaded_quiz()
         
-        # Map correct answers to letter format (A, B, C, D)
-        self.answers = tuple(self.convert_answer_to_letter(q['correct_answer'], q['options']) for q in selected)
+        if source == "network":
+            loaded_text = f"✓ Loaded {len(self.all_questions)} questions from sheet!"
+            if self.all_questions.invalid_rows:
+                loaded_text += f" ({len(self.all_questions.invalid_rows)} invalid rows skipped)"
+            self.feedback_label.config(text=loaded_text, fg="#00FF00")
     
-    def convert_answer_to_letter(self, correct_answer, options):
+    def set_question_bank(self, questions):
         
-        # If already a letter, return it
-        if correct_answer in ['A', 'B', 'C', 'D']:
-            return correct_answer
+        self.all_questions = questions
+        self.engine.set_bank(questions)
+    
+    def start_loaded_quiz(self):
         
-        # Otherwise, find the index of the correct answer in options
-        correct_answer_clean = correct_answer.strip()
-        for idx, option in enumerate(options):
-            if option.strip() == correct_answer_clean:
-                return chr(ord('A') + idx)
+        self.select_random_questions()
         
-        # Default to A if not found
-        return 'A'
+        self.submit_btn.config(state=tk.NORMAL)
+        self.skip_btn.config(state=tk.NORMAL)
+        self.display_question()
+    
+    def select_random_questions(self, num_questions=5, categories=None, difficulties=None, tags=None):
+       
+        self.engine.start(num_questions, categories=categories, difficulties=difficulties, tags=tags)
     
     def init_camera(self):
         """Initialize camera and face detection"""
         try:
-            self.cap = cv2.VideoCapture(0)
+            self.preview_sequence = 0
+            if self.proctoring_config.use_process:
+                # Capture and detection run in a child process; only results and the preview come back.
+                # It opens the camera in the background and check_camera_started picks up the outcome
+                self.cap = ProctoringWorker(self.proctoring_config)
+                self.frame_exchange = self.cap.frames
+                self.camera_active = True
+                self.timers.after(CAMERA_START_POLL_MS, self.check_camera_started)
+                return
+            
+            # Backs off and reopens the device when it stops delivering frames
+            source = self.proctoring_config.source
+            self.cap = CaptureSupervisor(lambda: open_frame_source(source))
+            self.frame_exchange = FrameExchange()
             if not self.cap.isOpened():
                 messagebox.showwarning("Camera Error", "Could not access camera. Proceeding without camera monitoring.")
                 return
             
             try:
-                self.face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
-                self.eye_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_eye.xml')
+                self.face_detector = self.proctoring_config.create_detector()
                 self.camera_active = True
             except Exception as e:
                 messagebox.showwarning("Detection Error", f"Could not load face detection models: {e}")
@@ -199,65 +263,105 @@ class QuizGame:
         except Exception as e:
             messagebox.showwarning("Camera Error", f"Could not initialize camera: {e}")
     
+    def check_camera_started(self):
+        
+        worker = self.cap
+        if worker is None or not self.camera_active:
+            return
+        if worker.isOpened():
+            if self.monitoring:
+                self.camera_thread = threading.Thread(target=self.receive_detections, daemon=True)
+                self.camera_thread.start()
+        elif worker.starting:
+            self.timers.after(CAMERA_START_POLL_MS, self.check_camera_started)
+        else:
+            # Same outcome as a camera that cannot be opened in-process, only found out later
+            self.stop_camera()
+            self.cap = None
+            if hasattr(self, 'camera_container') and self.camera_container.winfo_exists():
+                self.camera_container.destroy()
+            messagebox.showwarning("Camera Error", f"Could not start camera monitoring: {worker.error}. Proceeding without it.")
+    
     def start_camera_monitoring(self):
         
         if self.camera_active:
             self.monitoring = True
-            self.camera_thread = threading.Thread(target=self.monitor_camera, daemon=True)
-            self.camera_thread.start()
+            # In process mode check_camera_started starts the detection thread once the camera is open
+            if not self.proctoring_config.use_process:
+                self.camera_thread = threading.Thread(target=self.monitor_camera, daemon=True)
+                self.camera_thread.start()
             self.update_camera_display()
     
     def monitor_camera(self):
         
-        while self.monitoring and self.camera_active:
-            ret, frame = self.cap.read()
+        # Capture and preview run at the camera's rate; detection only at the configured rate
+        scheduler = DetectionScheduler(self.proctoring_config.detection_rate)
+        self.motion_gate = self.proctoring_config.create_motion_gate()
+        faces, face_eyes = [], []
+        # A restart replaces self.cap; this thread then stops instead of sharing the new device
+        cap = self.cap
+        while self.monitoring and self.camera_active and cap is self.cap:
+            ret, frame = cap.read()
             if not ret:
+                # The supervisor has already slept for its backoff delay
                 continue
             
             frame = cv2.flip(frame, 1)
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            faces = self.face_cascade.detectMultiScale(gray, 1.3, 5)
-            
-            if len(faces) == 0:
-                self.face_detected = False
-                self.looking_away_count += 1
-                if self.looking_away_count > 30:
-                    self.handle_face_not_detected()
-                    self.looking_away_count = 0
-            else:
-                self.face_detected = True
-                self.looking_away_count = 0
-                
-                for (x, y, w, h) in faces:
-                    cv2.rectangle(frame, (x, y), (x+w, y+h), (0, 255, 0), 2)
-                    
-                    current_position = (x, y, w, h)
-                    if self.last_face_position is not None:
-                        dx = abs(x - self.last_face_position[0])
-                        dy = abs(y - self.last_face_position[1])
-                        dw = abs(w - self.last_face_position[2])
-                        
-                        if dx > 50 or dy > 50 or dw > 30:
-                            self.body_movement_warnings += 1
-                            if self.body_movement_warnings > 5:
-                                self.handle_excessive_movement()
-                                self.body_movement_warnings = 0
-                    
-                    self.last_face_position = current_position
-                    
-                    roi_gray = gray[y:y+h, x:x+w]
-                    roi_color = frame[y:y+h, x:x+w]
-                    eyes = self.eye_cascade.detectMultiScale(roi_gray)
-                    
-                    for (ex, ey, ew, eh) in eyes:
-                        cv2.rectangle(roi_color, (ex, ey), (ex+ew, ey+eh), (255, 0, 0), 2)
-                    
-                    if len(eyes) < 2:
-                        self.eyes_looking_away = True
-                    else:
-                        self.eyes_looking_away = False
+            now = time.monotonic()
+            if scheduler.due(now):
+                # Haar or DNN backend, per the proctoring config; a static scene keeps the last result
+                if self.motion_gate.should_detect(frame, now):
+                    faces, face_eyes = self.face_detector.detect(frame)
+                self.update_presence(faces, face_eyes, now, (frame.shape[1], frame.shape[0]))
             
-            self.camera_frame = frame
+            # Shrink, convert and annotate here so the Tk thread only pastes pixels;
+            # the latest detection is drawn on the frames in between too
+            self.frame_exchange.publish(render_preview(frame, faces, face_eyes))
+    
+    def receive_detections(self):
+        
+        # Process mode: the worker captures and detects, this thread only applies its results
+        worker = self.cap
+        while self.monitoring and self.camera_active and worker is self.cap:
+            detection = worker.next_detection(timeout=0.5)
+            if detection is not None:
+                self.update_presence(*detection)
+    
+    def update_presence(self, faces, face_eyes, now, frame_size):
+        """Apply one detection result; all thresholds are in seconds, not frames."""
+        config = self.proctoring_config
+        elapsed = now - self.last_presence_time if self.last_presence_time is not None else 0.0
+        self.last_presence_time = now
+        track = self.face_tracker.update(faces, frame_size, now)
+        
+        if len(faces) == 0:
+            self.face_detected = False
+            self.movement_seconds = 0.0
+            if self.face_missing_since is None:
+                self.face_missing_since = now
+            elif now - self.face_missing_since > config.face_missing_seconds:
+                self.handle_face_not_detected()
+                self.face_missing_since = now
+            return
+        
+        self.face_detected = True
+        self.face_missing_since = None
+        
+        # Speeds come from the smoothed track, in frame sizes per second
+        if track.speed > config.movement_speed or track.scale_rate > config.resize_speed:
+            self.movement_seconds += elapsed
+            if self.movement_seconds > config.movement_warning_seconds:
+                self.handle_excessive_movement()
+                self.movement_seconds = 0.0
+        else:
+            self.movement_seconds = 0.0
+        
+        # The largest face is the candidate's
+        candidate = max(range(len(faces)), key=lambda i: faces[i][2] * faces[i][3])
+        if len(face_eyes[candidate]) < 2:
+            self.eyes_looking_away = True
+        else:
+            self.eyes_looking_away = False
     
     def handle_face_not_detected(self):
         
@@ -281,18 +385,26 @@ class QuizGame:
     
     def update_camera_display(self):
         
-        if self.camera_active and self.monitoring and self.camera_frame is not None:
-            frame_rgb = cv2.cvtColor(self.camera_frame, cv2.COLOR_BGR2RGB)
-            frame_resized = cv2.resize(frame_rgb, (200, 150))
-            img = Image.fromarray(frame_resized)
-            imgtk = ImageTk.PhotoImage(image=img)
-            
-            if hasattr(self, 'camera_label') and self.camera_label.winfo_exists():
-                self.camera_label.imgtk = imgtk
-                self.camera_label.configure(image=imgtk)
+        if self.camera_active and self.monitoring:
+            latest = self.frame_exchange.newer_than(self.preview_sequence)
+            if latest is not None:
+                self.preview_sequence, preview = latest
+                if hasattr(self, 'camera_label') and self.camera_label.winfo_exists():
+                    # Update the label's one PhotoImage in place instead of creating a new one per frame
+                    self.camera_photo.paste(Image.fromarray(preview))
             
             if hasattr(self, 'camera_status_label') and self.camera_status_label.winfo_exists():
-                if self.face_detected:
+                health = self.cap.health
+                if health == HEALTH_STARTING:
+                    status_text = "⏳ Starting Camera"
+                    status_color = "#FFA500"
+                elif health == HEALTH_OFFLINE:
+                    status_text = f"⚠ Camera Lost - Reconnecting ({self.cap.reopens})"
+                    status_color = "#FF0000"
+                elif health == HEALTH_DEGRADED:
+                    status_text = "⚠ Camera Unstable"
+                    status_color = "#FFA500"
+                elif self.face_detected:
                     status_text = "✓ Face Detected"
                     status_color = "#00FF00"
                 else:
@@ -301,7 +413,7 @@ class QuizGame:
                 self.camera_status_label.config(text=status_text, fg=status_color)
         
         if self.monitoring:
-            self.root.after(30, self.update_camera_display)
+            self.timers.after(30, self.update_camera_display)
     
     def stop_camera(self):
        
@@ -361,10 +473,10 @@ class QuizGame:
         )
         self.eye_label.place(x=25, y=85)
         
-        self.update_eye_position()
+        self.animations.add('eyes', self.update_eye_position, 0.05)
     
-    def update_eye_position(self):
-        
+    def update_eye_position(self, now=None):
+        """Animation step: point the pupils at the mouse while eye tracking is on."""
         if self.eye_tracking_active and hasattr(self, 'left_pupil'):
             import math
             
@@ -399,8 +511,8 @@ class QuizGame:
                 pupil_x_right - 5, pupil_y_right - 5,
                 pupil_x_right + 5, pupil_y_right + 5
             )
-            
-            self.root.after(50, self.update_eye_position)
+            return True
+        return False
     
     def update_datetime(self):
         
@@ -409,7 +521,7 @@ class QuizGame:
             date_str = now.strftime("%A, %B %d, %Y")
             time_str = now.strftime("%I:%M:%S %p")
             self.datetime_label.config(text=f"📅 {date_str} | ⏰ {time_str}")
-            self.root.after(1000, self.update_datetime)
+            self.timers.after(1000, self.update_datetime)
     
     def toggle_fullscreen(self):
        
@@ -417,23 +529,21 @@ class QuizGame:
         self.root.attributes('-fullscreen', not current_state)
     
     def create_gradient_background(self):
-
-        width = self.screen_width
-        height = self.screen_height
-        
-        gradient = Image.new('RGB', (width, height), '#1a1a2e')
-        draw = ImageDraw.Draw(gradient)
-        
-        for i in range(height):
-            r = int(26 + (128 - 26) * (i / height))
-            g = int(26 + (0 - 26) * (i / height))
-            b = int(46 + (128 - 46) * (i / height))
-            draw.rectangle([(0, i), (width, i+1)], fill=(r, g, b))
-        
-        self.bg_image = ImageTk.PhotoImage(gradient)
-        
-        self.bg_label = tk.Label(self.root, image=self.bg_image)
-        self.bg_label.place(x=0, y=0, relwidth=1, relheight=1)
+        """Place the gradient behind the current screen, reusing the PhotoImage between screens.
+        
+        The background is a canvas so celebration particles can be drawn on it, behind the widgets.
+        """
+        key = (self.screen_width, self.screen_height, GRADIENT_TOP, GRADIENT_BOTTOM)
+        if self.bg_image is None or self.bg_image_key != key:
+            self.bg_image = ImageTk.PhotoImage(render_gradient(*key))
+            self.bg_image_key = key
+        
+        if self.particles is not None:
+            self.particles.clear()
+        self.bg_canvas = tk.Canvas(self.root, bg='#1a1a2e', highlightthickness=0, bd=0)
+        self.bg_canvas.create_image(0, 0, image=self.bg_image, anchor=tk.NW)
+        self.bg_canvas.place(x=0, y=0, relwidth=1, relheight=1)
+        self.particles = ParticleSystem(self.bg_canvas, self.animations)
     
     def create_colorful_emoji(self, canvas, emoji_text, x, y, size=100):
         
@@ -492,19 +602,21 @@ class QuizGame:
         self.tab_counter_label.place(x=self.screen_width-220, y=65)
         
         if self.camera_active:
-            camera_container = tk.Frame(self.root, bg='#1a1a2e')
-            camera_container.place(x=self.screen_width-230, y=100)
+            self.camera_container = tk.Frame(self.root, bg='#1a1a2e')
+            self.camera_container.place(x=self.screen_width-230, y=100)
             
             tk.Label(
-                camera_container,
+                self.camera_container,
                 text="📹 Camera Monitor",
                 font=("Arial", 11, "bold"),
                 bg='#1a1a2e',
                 fg='#FFD700'
             ).pack()
             
+            self.camera_photo = ImageTk.PhotoImage('RGB', PREVIEW_SIZE)
             self.camera_label = tk.Label(
-                camera_container,
+                self.camera_container,
+                image=self.camera_photo,
                 bg='#000000',
                 width=200,
                 height=150
@@ -512,7 +624,7 @@ class QuizGame:
             self.camera_label.pack(pady=5)
             
             self.camera_status_label = tk.Label(
-                camera_container,
+                self.camera_container,
                 text="✓ Face Detected",
                 font=("Arial", 10, "bold"),
                 bg='#1a1a2e',
@@ -595,6 +707,9 @@ class QuizGame:
         self.question_label.pack(pady=25, padx=30)
         
         self.selected_option = tk.StringVar()
+        # Selection styling follows the variable; only the options whose state changed are touched
+        self.highlighted_option = ""
+        self.selected_option.trace_add('write', self.highlight_selected_option)
         self.option_buttons = []
         self.option_frames = []
         
@@ -715,19 +830,30 @@ class QuizGame:
             bg='#1a1a2e'
         )
         self.feedback_label.place(relx=0.5, rely=0.95, anchor=tk.CENTER)
+        
+        if not self.questions:
+            self.show_loading_state()
+    
+    def show_loading_state(self):
+        
+        self.counter_label.config(text="")
+        self.question_label.config(text="⏳ Loading questions...")
+        self.submit_btn.config(state=tk.DISABLED)
+        self.skip_btn.config(state=tk.DISABLED)
     
     def animate_title(self):
         
         colors = ['#FFD700', '#FF6347', '#00FF00', '#00FFFF', '#FF69B4', '#FFA500']
         self.color_index = 0
         
-        def change_color():
+        def change_color(now):
             if hasattr(self, 'title_label') and self.title_label.winfo_exists():
                 self.title_label.config(fg=colors[self.color_index % len(colors)])
                 self.color_index += 1
-                self.root.after(500, change_color)
+                return True
+            return False
         
-        change_color()
+        self.animations.add('title', change_color, 0.5)
     
     def display_question(self):
         if self.question_num < len(self.questions):
@@ -740,47 +866,43 @@ class QuizGame:
             
             self.question_label.config(text=self.questions[self.question_num])
             
-            option_colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#FFA07A']
             for i in range(4):
                 option_text = self.options[self.question_num][i]
-                letter = chr(ord('A') + i)
                 btn, text_label, opt_frame, letter_box = self.option_buttons[i]
                 
                 # Update text label
-                text_label.config(text=option_text, fg=option_colors[i])
-                
-                # Reset frame appearance
-                opt_frame.config(relief=tk.RAISED, bd=2, bg="#16213e")
-                letter_box.config(bg=option_colors[i])
+                text_label.config(text=option_text)
             
+            # Clearing the selection restyles the previously selected option
             self.selected_option.set("")
             self.feedback_label.config(text="")
-            self.highlight_selected_option()
         else:
             self.show_results()
     
-    def highlight_selected_option(self):
-       
+    def highlight_selected_option(self, *args):
+        """Trace callback of selected_option: restyle the option that lost the selection and the one that got it"""
         selected = self.selected_option.get()
+        if selected == self.highlighted_option:
+            return
+        
+        for letter in (self.highlighted_option, selected):
+            if letter:
+                self.style_option(ord(letter) - ord('A'), letter == selected)
+        self.highlighted_option = selected
+    
+    def style_option(self, index, selected):
+        
         option_colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#FFA07A']
+        btn, text_label, opt_frame, letter_box = self.option_buttons[index]
         
-        for i in range(4):
-            btn, text_label, opt_frame, letter_box = self.option_buttons[i]
-            letter = chr(ord('A') + i)
-            
-            if letter == selected:
-                # Highlight selected option
-                opt_frame.config(relief=tk.SUNKEN, bd=4, bg="#2a3a4e")
-                letter_box.config(bg="#00FF00", fg="black", relief=tk.SUNKEN)
-                text_label.config(fg="#00FF00")
-            else:
-                # Reset non-selected options
-                opt_frame.config(relief=tk.RAISED, bd=2, bg="#16213e")
-                letter_box.config(bg=option_colors[i], relief=tk.RAISED)
-                text_label.config(fg=option_colors[i])
-        
-        # Check again after 100ms for continuous updating
-        self.root.after(100, self.highlight_selected_option)
+        if selected:
+            opt_frame.config(relief=tk.SUNKEN, bd=4, bg="#2a3a4e")
+            letter_box.config(bg="#00FF00", fg="black", relief=tk.SUNKEN)
+            text_label.config(fg="#00FF00")
+        else:
+            opt_frame.config(relief=tk.RAISED, bd=2, bg="#16213e")
+            letter_box.config(bg=option_colors[index], fg="white", relief=tk.RAISED)
+            text_label.config(fg=option_colors[index])
     
     def select_option(self, index):
        
@@ -789,15 +911,13 @@ class QuizGame:
     
     def skip_question(self):
         
-        self.skipped_questions.append(self.question_num + 1)
-        self.guesses.append("SKIPPED")
+        self.engine.skip()
         self.feedback_label.config(text="⏭️ Question Skipped!", fg="#FFA500")
-        self.question_num += 1
         
-        self.root.after(1500, self.display_question)
+        self.timers.after(1500, self.display_question)
         self.submit_btn.config(state=tk.DISABLED)
         self.skip_btn.config(state=tk.DISABLED)
-        self.root.after(1500, lambda: (self.submit_btn.config(state=tk.NORMAL), self.skip_btn.config(state=tk.NORMAL)))
+        self.timers.after(1500, lambda: (self.submit_btn.config(state=tk.NORMAL), self.skip_btn.config(state=tk.NORMAL)))
     
     def check_answer(self):
         
@@ -807,101 +927,46 @@ class QuizGame:
             messagebox.showwarning("Warning", "Please select an answer!")
             return
         
-        self.guesses.append(guess)
+        correct, correct_answer = self.engine.answer(guess)
         
         # Highlight the selected answer
         self.show_selected_answer(guess)
         
-        if guess == self.answers[self.question_num]:
-            self.score += 1
+        if correct:
             self.feedback_label.config(text="✓ CORRECT! 🎉", fg="#00FF00")
             self.show_fireworks_animation()
         else:
-            correct_answer = self.answers[self.question_num]
             self.feedback_label.config(
                 text=f"✗ INCORRECT! 😞 Correct answer: {correct_answer}",
                 fg="#FF0000"
             )
             self.show_thumbs_down_animation()
         
-        self.question_num += 1
-        
-        self.root.after(1500, self.display_question)
+        self.timers.after(1500, self.display_question)
         self.submit_btn.config(state=tk.DISABLED)
         self.skip_btn.config(state=tk.DISABLED)
-        self.root.after(1500, lambda: (self.submit_btn.config(state=tk.NORMAL), self.skip_btn.config(state=tk.NORMAL)))
+        self.timers.after(1500, lambda: (self.submit_btn.config(state=tk.NORMAL), self.skip_btn.config(state=tk.NORMAL)))
     
     def show_selected_answer(self, selected):
         
-        option_colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#FFA07A']
-        
         for i in range(4):
-            btn, text_label, opt_frame, letter_box = self.option_buttons[i]
-            letter = chr(ord('A') + i)
-            
-            if letter == selected:
-                opt_frame.config(relief=tk.SUNKEN, bd=4, bg="#2a3a4e")
-                letter_box.config(bg="#00FF00", fg="black", relief=tk.SUNKEN)
-                text_label.config(fg="#00FF00")
-            else:
-                opt_frame.config(relief=tk.RAISED, bd=2, bg="#16213e")
-                letter_box.config(bg=option_colors[i], relief=tk.RAISED)
-                text_label.config(fg=option_colors[i])
+            self.style_option(i, chr(ord('A') + i) == selected)
+        self.highlighted_option = selected
     
     def show_fireworks_animation(self):
         
-        self.fireworks = []
-        colors = ['#FFD700', '#FF6347', '#00FF00', '#1E90FF', '#FF69B4', '#FFA500', 
-                  '#00FFFF', '#FF1493', '#7FFF00', '#FF4500']
-        
-        for burst_num in range(8):
-            x = 150 + (burst_num * (self.screen_width - 300) // 7)
-            y = 200 + (burst_num % 2) * 100
-            
-            for angle in range(0, 360, 30):
-                firework = tk.Label(
-                    self.root,
-                    text="✨",
-                    font=("Arial", 25),
-                    bg='#1a1a2e',
-                    fg=colors[burst_num % len(colors)]
-                )
-                firework.place(x=x, y=y)
-                self.fireworks.append(firework)
-                self.animate_firework(firework, x, y, angle)
-        
-        self.root.after(1500, self.clear_fireworks)
+        # Around the title, question and camera panel rather than hidden behind them
+        fireworks(self.particles, self.screen_width, regions=self.free_screen_regions())
     
-    def animate_firework(self, firework, start_x, start_y, angle):
-        
-        import math
-        
-        distance = 0
-        max_distance = 100
-        
-        def move():
-            nonlocal distance
-            if distance < max_distance:
-                distance += 10
-                rad = math.radians(angle)
-                new_x = start_x + distance * math.cos(rad)
-                new_y = start_y + distance * math.sin(rad)
-                firework.place(x=new_x, y=new_y)
-                
-                if distance > max_distance * 0.7:
-                    firework.config(font=("Arial", 18))
-                
-                self.root.after(30, move)
-            else:
-                firework.place_forget()
-        
-        move()
-    
-    def clear_fireworks(self):
-        
-        for firework in self.fireworks:
-            firework.destroy()
-        self.fireworks = []
+    def free_screen_regions(self):
+        """The parts of the screen no placed widget covers, where particles on the background canvas show"""
+        self.root.update_idletasks()
+        covered = []
+        for widget in self.root.place_slaves():
+            if widget is not self.bg_canvas:
+                x, y = widget.winfo_x(), widget.winfo_y()
+                covered.append((x, y, x + widget.winfo_width(), y + widget.winfo_height()))
+        return free_regions(self.screen_width, self.screen_height, covered)
     
     def show_thumbs_down_animation(self):
         
@@ -925,28 +990,36 @@ class QuizGame:
         self.animate_sad_emoji()
         self.animate_thumb_gesture()
         
-        self.root.after(1500, self.clear_sad_animation)
+        self.timers.after(1500, self.clear_sad_animation)
     
     def animate_sad_emoji(self):
         """Shake the sad emoji left and right"""
         positions = [0.5, 0.48, 0.5, 0.52, 0.5, 0.48, 0.5, 0.52, 0.5]
         colors = ['#FF6347', '#FF4500', '#FF1493', '#FF69B4', '#FF6347']
         
-        def shake(index=0):
+        index = 0
+        
+        def shake(now):
+            nonlocal index
             if index < len(positions) and hasattr(self, 'sad_emoji'):
                 self.sad_emoji.place(relx=positions[index], rely=0.5, anchor=tk.CENTER)
                 if index < len(colors):
                     self.sad_emoji.config(fg=colors[index % len(colors)])
-                self.root.after(80, lambda: shake(index + 1))
+                index += 1
+                return True
+            return False
         
-        shake()
+        self.animations.add('sad_emoji', shake, 0.08)
     
     def animate_thumb_gesture(self):
         
         x_positions = list(range(self.screen_width, self.screen_width//2 - 150, -50))
         colors = ['#FF0000', '#FF4500', '#FF6347', '#FF1493', '#FF0000']
         
-        def slide_in(index=0):
+        index = 0
+        
+        def slide_in(now):
+            nonlocal index
             if index < len(x_positions) and hasattr(self, 'thumb_down'):
                 self.thumb_down.place(x=x_positions[index], 
                                      y=self.screen_height//2 - 50)
@@ -956,9 +1029,11 @@ class QuizGame:
                 size = 100 - (index % 3) * 8
                 self.thumb_down.config(font=("Arial", size))
                 
-                self.root.after(60, lambda: slide_in(index + 1))
+                index += 1
+                return True
+            return False
         
-        slide_in()
+        self.animations.add('thumb_down', slide_in, 0.06)
     
     def clear_sad_animation(self):
        
@@ -967,126 +1042,27 @@ class QuizGame:
         if hasattr(self, 'thumb_down'):
             self.thumb_down.destroy()
     
-    def show_firecracker_animation(self):
-       
-        self.firecrackers = []
+    def show_firecracker_animation(self, regions=None):
         
-        for _ in range(30):
-            x = random.randint(50, self.screen_width - 50)
-            y = random.randint(50, self.screen_height - 50)
-            
-            for angle in range(0, 360, 15):
-                firecracker = tk.Label(
-                    self.root,
-                    text=random.choice(['💥', '✨', '🎆', '🎇', '⭐']),
-                    font=("Arial", random.randint(20, 40)),
-                    bg='#1a1a2e',
-                    fg=random.choice(['#FFD700', '#FF6347', '#00FF00', '#1E90FF', '#FF69B4', '#FFA500'])
-                )
-                firecracker.place(x=x, y=y)
-                self.firecrackers.append(firecracker)
-                self.animate_firecracker(firecracker, x, y, angle)
-        
-        self.root.after(5000, self.clear_firecrackers)
+        firecracker(self.particles, self.screen_width, self.screen_height, regions=regions)
     
-    def animate_firecracker(self, firecracker, start_x, start_y, angle):
-       
-        import math
-        
-        distance = 0
-        max_distance = random.randint(80, 150)
-        
-        def explode():
-            nonlocal distance
-            if distance < max_distance and firecracker.winfo_exists():
-                distance += random.randint(8, 15)
-                rad = math.radians(angle)
-                new_x = start_x + distance * math.cos(rad)
-                new_y = start_y + distance * math.sin(rad)
-                firecracker.place(x=new_x, y=new_y)
-                
-                if random.random() > 0.7:
-                    size = random.randint(15, 35)
-                    firecracker.config(font=("Arial", size))
-                
-                self.root.after(40, explode)
-            else:
-                if firecracker.winfo_exists():
-                    firecracker.place_forget()
-        
-        explode()
-    
-    def clear_firecrackers(self):
-        
-        for firecracker in self.firecrackers:
-            if firecracker.winfo_exists():
-                firecracker.destroy()
-        self.firecrackers = []
-    
-    def show_clapping_cartoon(self):
+    def show_clapping_cartoon(self, regions=None):
         
-        self.cartoon_body = tk.Label(
-            self.root,
+        # Drawn on the background canvas rather than as labels, so the particles fly over it
+        canvas = self.bg_canvas
+        self.cartoon_body = canvas.create_text(
+            self.screen_width * 0.5, self.screen_height * 0.15,
             text="🙂",
-            font=("Arial", 150),
-            bg='#1a1a2e'
-        )
-        self.cartoon_body.place(relx=0.5, rely=0.15, anchor=tk.CENTER)
-        
-        self.left_hand = tk.Label(
-            self.root,
-            text="👏",
-            font=("Arial", 80),
-            bg='#1a1a2e'
-        )
-        
-        self.right_hand = tk.Label(
-            self.root,
-            text="👏",
-            font=("Arial", 80),
-            bg='#1a1a2e'
+            font=("Arial", 150)
         )
+        self.left_hand = canvas.create_text(0, 0, text="👏", font=("Arial", 80), state='hidden')
+        self.right_hand = canvas.create_text(0, 0, text="👏", font=("Arial", 80), state='hidden')
         
-        self.confetti = []
-        self.create_confetti()
+        confetti(self.particles, self.screen_width, self.screen_height, regions=regions)
         
         self.animate_clapping()
         
-        self.root.after(3000, self.stop_clapping)
-    
-    def create_confetti(self):
-        
-        confetti_emojis = ['🎉', '🎊', '✨', '⭐', '🌟', '💫']
-        colors = ['#FFD700', '#FF6347', '#00FF00', '#1E90FF', '#FF69B4', '#FFA500']
-        
-        for i in range(30):
-            x = random.randint(100, self.screen_width - 100)
-            y = random.randint(0, 150)
-            
-            confetti = tk.Label(
-                self.root,
-                text=random.choice(confetti_emojis),
-                font=("Arial", random.randint(20, 40)),
-                bg='#1a1a2e',
-                fg=random.choice(colors)
-            )
-            confetti.place(x=x, y=y)
-            self.confetti.append(confetti)
-            self.animate_confetti(confetti, x, y)
-    
-    def animate_confetti(self, confetti, start_x, start_y):
-       
-        y = start_y
-        
-        def fall():
-            nonlocal y
-            if y < self.screen_height and confetti.winfo_exists():
-                y += random.randint(5, 15)
-                x_offset = random.randint(-5, 5)
-                confetti.place(x=start_x + x_offset, y=y)
-                self.root.after(50, fall)
-        
-        fall()
+        self.timers.after(3000, self.stop_clapping)
     
     def animate_clapping(self):
        
@@ -1096,43 +1072,46 @@ class QuizGame:
             (0.48, 0.18, 0.52, 0.18),
         ]
         
-        def clap():
-            if self.clap_count < 12 and hasattr(self, 'left_hand') and hasattr(self, 'right_hand'):
+        canvas = self.bg_canvas
+        
+        def clap(now):
+            if self.clap_count < 12 and canvas.winfo_exists():
                 pos_index = self.clap_count % 2
                 left_x, left_y, right_x, right_y = positions[pos_index]
                 
-                self.left_hand.place(relx=left_x, rely=left_y, anchor=tk.CENTER)
-                self.right_hand.place(relx=right_x, rely=right_y, anchor=tk.CENTER)
+                canvas.coords(self.left_hand, self.screen_width * left_x, self.screen_height * left_y)
+                canvas.coords(self.right_hand, self.screen_width * right_x, self.screen_height * right_y)
+                canvas.itemconfigure(self.left_hand, state='normal')
+                canvas.itemconfigure(self.right_hand, state='normal')
                 
                 colors = ['#FFD700', '#FF6347', '#00FF00', '#1E90FF', '#FF69B4']
-                if hasattr(self, 'cartoon_body'):
-                    self.cartoon_body.config(fg=colors[self.clap_count % len(colors)])
+                canvas.itemconfigure(self.cartoon_body, fill=colors[self.clap_count % len(colors)])
                 
                 self.clap_count += 1
-                self.root.after(250, clap)
+                return True
+            return False
         
-        clap()
+        self.animations.add('clapping', clap, 0.25)
     
     def stop_clapping(self):
         
-        if hasattr(self, 'cartoon_body'):
-            self.cartoon_body.destroy()
-        if hasattr(self, 'left_hand'):
-            self.left_hand.destroy()
-        if hasattr(self, 'right_hand'):
-            self.right_hand.destroy()
-        
-        for confetti in self.confetti:
-            confetti.destroy()
-        self.confetti = []
+        self.animations.remove('clapping')
+        if self.bg_canvas.winfo_exists():
+            self.bg_canvas.delete(self.cartoon_body, self.left_hand, self.right_hand)
+    
+    def clear_screen(self):
+        """Cancel everything the current screen scheduled, then destroy its widgets"""
+        self.timers.cancel_all()
+        self.animations.stop()
+        for widget in self.root.winfo_children():
+            widget.destroy()
     
     def show_results_terminated(self):
          
         self.eye_tracking_active = False
         self.stop_camera()
         
-        for widget in self.root.winfo_children():
-            widget.destroy()
+        self.clear_screen()
         
         self.create_gradient_background()
         
@@ -1174,11 +1153,7 @@ class QuizGame:
             wraplength=600
         ).pack(pady=10)
         
-        questions_attempted = len(self.guesses)
-        if questions_attempted > 0:
-            score_percentage = int(self.score / questions_attempted * 100)
-        else:
-            score_percentage = 0
+        questions_attempted = self.engine.results()['attempted']
         
         tk.Label(
             results_frame,
@@ -1250,14 +1225,10 @@ class QuizGame:
         self.eye_tracking_active = False
         self.stop_camera()
         
-        for widget in self.root.winfo_children():
-            widget.destroy()
+        self.clear_screen()
         
         self.create_gradient_background()
         
-        self.show_firecracker_animation()
-        self.show_clapping_cartoon()
-        
         results_frame = tk.Frame(self.root, bg='#1a1a2e')
         results_frame.place(relx=0.5, rely=0.60, anchor=tk.CENTER)
         
@@ -1279,7 +1250,7 @@ class QuizGame:
             fg='#FFD700'
         ).pack(pady=10)
         
-        score_percentage = int(self.score / len(self.questions) * 100)
+        score_percentage = self.engine.results()['percentage']
         
         if score_percentage >= 80:
             score_color = "#00FF00"
@@ -1443,21 +1414,22 @@ class QuizGame:
             pady=12,
             activebackground="#8e44ad"
         ).pack(pady=10)
+        
+        # Particles cannot be drawn over widgets, so celebrate in the space around the results
+        regions = self.free_screen_regions()
+        self.show_firecracker_animation(regions)
+        self.show_clapping_cartoon(regions)
     
     def restart_quiz(self):
-        self.guesses = []
-        self.skipped_questions = []
-        self.score = 0
-        self.question_num = 0
         self.tab_switches = 0
-        self.looking_away_count = 0
-        self.body_movement_warnings = 0
-        self.last_face_position = None
+        self.face_missing_since = None
+        self.face_tracker.reset()
+        self.movement_seconds = 0.0
+        self.last_presence_time = None
         
         self.stop_camera()
         
-        for widget in self.root.winfo_children():
-            widget.destroy()
+        self.clear_screen()
         
         self.init_camera()
         self.select_random_questions()
@@ -1472,42 +1444,39 @@ class QuizGame:
 
 
 if __name__ == "__main__":
-    root = tk.Tk()
-    app = QuizGame(root)
-    
-    def on_closing():
-        if hasattr(app, 'cap') and app.cap is not None:
-            app.stop_camera()
-        root.destroy()
+    import argparse
     
-    root.protocol("WM_DELETE_WINDOW", on_closing)
-    root.mainloop()
-    self.skip_btn.config(state=tk.DISABLED)
-    self.root.after(1500, lambda: (self.submit_btn.config(state=tk.NORMAL), self.skip_btn.config(state=tk.NORMAL)))
+    parser = argparse.ArgumentParser(description="Brain Buster Quiz Game")
+    parser.add_argument("--server", action="store_true",
+                        help="host many quiz sessions over HTTP instead of opening the kiosk window")
+    parser.add_argument("--host", default="127.0.0.1", help="server mode: address to listen on")
+    parser.add_argument("--port", type=int, default=8080, help="server mode: port to listen on")
+    parser.add_argument("--detection-rate", type=float, default=DEFAULT_DETECTION_RATE,
+                        help="face detection passes per second (capture and preview keep the camera's rate)")
+    parser.add_argument("--camera-source", default=DEFAULT_SOURCE,
+                        help="proctoring frames: camera[:N], a video file, an image directory or synthetic[:WxH]")
+    parser.add_argument("--face-detector", choices=DETECTORS, default="haar",
+                        help="face detection backend; dnn needs 'python proctoring.py --download-dnn-model' once")
+    parser.add_argument("--proctoring-process", action="store_true",
+                        help="run camera capture and face detection in a separate process")
+    args = parser.parse_args()
     
-    def check_answer(self):
-        guess = self.selected_option.get()
-        
-        if not guess:
-            messagebox.showwarning("Warning", "Please select an answer!")
-            return
-        
-        self.guesses.append(guess)
-        
-        if guess == self.answers[self.question_num]:
-            self.score += 1
-            self.feedback_label.config(text="✓ CORRECT! 🎉", fg="#00FF00")
-            self.show_fireworks_animation()
-        else:
-            correct_answer = self.answers[self.question_num]
-            self.feedback_label.config(
-                text=f"✗ INCORRECT! 😞 Correct answer: {correct_answer}",
-                fg="#FF0000"
-            )
-            self.show_thumbs_down_animation()
-        
-        self.question_num += 1
-        
-        self.root.after(1500, self.display_question)
-
-        self.submit_btn.config(state=tk.DISABLED)
+    if args.server:
+        import quiz_server
+        quiz_server.run(args.host, args.port)
+    else:
+        root = tk.Tk()
+        app = QuizGame(root, ProctoringConfig(
+            source=args.camera_source,
+            detection_rate=args.detection_rate,
+            detector=args.face_detector,
+            use_process=args.proctoring_process
+        ))
+        
+        def on_closing():
+            if hasattr(app, 'cap') and app.cap is not None:
+                app.stop_camera()
+            root.destroy()
+        
+        root.protocol("WM_DELETE_WINDOW", on_closing)
+        root.mainloop()
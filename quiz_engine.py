@@ -0,0 +1,132 @@
+"""UI-free quiz logic: question selection, answering, skipping and scoring.
+
+The Tk ``QuizGame`` is a view over a ``QuizEngine``; so are the quiz server
+sessions and the load-test harness, which lets all of them share one loaded
+question bank.
+"""
+from sampling import QuestionSampler, RecentQuestions
+
+SKIPPED = "SKIPPED"
+DEFAULT_NUM_QUESTIONS = 5
+
+
+class QuizEngine:
+    """One candidate's quiz over a question bank."""
+
+    def __init__(self, bank, sampler=None, index=None, recent=None, num_questions=DEFAULT_NUM_QUESTIONS):
+        self.num_questions = num_questions
+        self.recent = recent if recent is not None else RecentQuestions()
+        self.set_bank(bank, sampler, index)
+
+        self.question_ids = ()
+        self.questions = ()
+        self.options = ()
+        self.answers = ()
+        self.reset()
+
+    def set_bank(self, bank, sampler=None, index=None):
+        """Switch to a new bank; the current quiz keeps the questions it already drew.
+
+        ``index`` defaults to the bank's own ``question_index()``.
+        """
+        self.bank = bank
+        self.sampler = sampler if sampler is not None else QuestionSampler(bank)
+        self.index = index
+
+    def reset(self):
+        self.guesses = []
+        self.skipped_questions = []
+        self.score = 0
+        self.question_num = 0
+
+    def start(self, num_questions=None, categories=None, difficulties=None, tags=None):
+        """Draw a fresh set of questions and start answering from the first one."""
+        if num_questions is None:
+            num_questions = self.num_questions
+
+        if tags:
+            # Themed quiz - look the tagged questions up instead of scanning the bank
+            index = self.index if self.index is not None else self.bank.question_index()
+            candidates = index.find(categories, difficulties, tags)
+            selected = self.sampler.sample_from(candidates, num_questions, recent=self.recent)
+        else:
+            # Uniform over the bank, skipping questions this candidate saw in recent rounds
+            selected = self.sampler.sample(
+                num_questions,
+                categories=categories,
+                difficulties=difficulties,
+                recent=self.recent
+            )
+
+        bank = self.bank
+        self.question_ids = tuple(selected)
+        self.questions = tuple(bank.question(i) for i in selected)
+        self.options = tuple(bank.options(i) for i in selected)
+        # Answers were resolved to letters once, when the bank was loaded
+        self.answers = tuple(bank.answer_letter(i) for i in selected)
+        self.reset()
+
+    @property
+    def finished(self):
+        return self.question_num >= len(self.questions)
+
+    @property
+    def current_question(self):
+        """``(question, options)`` for the question being asked, or None when finished."""
+        if self.finished:
+            return None
+        return self.questions[self.question_num], self.options[self.question_num]
+
+    def answer(self, guess):
+        """Record ``guess`` (a letter) for the current question.
+
+        Returns ``(correct, correct_letter)``.
+        """
+        if self.finished:
+            raise ValueError("quiz is already finished")
+        if guess not in ('A', 'B', 'C', 'D'):
+            raise ValueError(f"invalid answer {guess!r}")
+
+        correct_answer = self.answers[self.question_num]
+        self.guesses.append(guess)
+        correct = guess == correct_answer
+        if correct:
+            self.score += 1
+        self.question_num += 1
+        return correct, correct_answer
+
+    def skip(self):
+        if self.finished:
+            raise ValueError("quiz is already finished")
+
+        self.skipped_questions.append(self.question_num + 1)
+        self.guesses.append(SKIPPED)
+        self.question_num += 1
+
+    def results(self):
+        """Score summary and answer key for the questions attempted so far."""
+        total = len(self.questions)
+        attempted = len(self.guesses)
+        answer_key = []
+        for number, (guess, correct_answer) in enumerate(zip(self.guesses, self.answers), start=1):
+            if guess == SKIPPED:
+                status = "skipped"
+            else:
+                status = "correct" if guess == correct_answer else "incorrect"
+            answer_key.append({
+                'number': number,
+                'guess': guess,
+                'correct_answer': correct_answer,
+                'status': status
+            })
+
+        return {
+            'score': self.score,
+            'total': total,
+            'attempted': attempted,
+            'skipped': len(self.skipped_questions),
+            'percentage': int(self.score / total * 100) if total else 0,
+            'attempted_percentage': int(self.score / attempted * 100) if attempted else 0,
+            'finished': self.finished,
+            'answer_key': answer_key
+        }
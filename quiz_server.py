@@ -0,0 +1,350 @@
+"""Multi-session quiz server.
+
+Hosts many concurrent quiz sessions in one process over a small JSON/HTTP
+API, all sharing a single loaded question bank. Each session is a
+``QuizEngine``; candidates are identified by an optional ``candidate`` id so
+their recently seen questions are not repeated across sessions.
+
+    POST   /sessions                    start a quiz -> session id + first question
+    GET    /sessions/<id>               current question and progress
+    POST   /sessions/<id>/answer        {"answer": "B"} -> correct?, next question
+    POST   /sessions/<id>/skip          skip the current question
+    GET    /sessions/<id>/results       score and answer key
+    DELETE /sessions/<id>               discard the session
+    GET    /health                      session and bank counts
+
+Run with ``python quiz_server.py [--host HOST] [--port PORT]`` or
+``python quiz.py --server``.
+"""
+import argparse
+import asyncio
+import json
+import time
+import traceback
+import uuid
+from collections import OrderedDict
+
+from question_bank import DEFAULT_QUESTIONS, QuestionStore, load_question_bank
+from quiz_engine import DEFAULT_NUM_QUESTIONS, QuizEngine
+from sampling import QuestionSampler, RecentQuestions
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+
+SESSION_IDLE_TIMEOUT = 60 * 60
+SESSION_SWEEP_INTERVAL = 60
+MAX_REMEMBERED_CANDIDATES = 10000
+MAX_NUM_QUESTIONS = 100
+MAX_HEADER_LINES = 100
+MAX_BODY_SIZE = 64 * 1024
+
+STATUS_TEXT = {
+    200: "OK",
+    201: "Created",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    409: "Conflict",
+    413: "Payload Too Large",
+    414: "URI Too Long",
+    431: "Request Header Fields Too Large",
+    500: "Internal Server Error",
+}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class QuizSession:
+    def __init__(self, session_id, candidate, engine):
+        self.session_id = session_id
+        self.candidate = candidate
+        self.engine = engine
+        self.last_active = time.monotonic()
+
+    def state(self):
+        engine = self.engine
+        state = {
+            'session_id': self.session_id,
+            'candidate': self.candidate,
+            'number': min(engine.question_num + 1, len(engine.questions)),
+            'total': len(engine.questions),
+            'score': engine.score,
+            'finished': engine.finished,
+            'question': None
+        }
+        current = engine.current_question
+        if current is not None:
+            question, options = current
+            state['question'] = {'text': question, 'options': dict(zip("ABCD", options))}
+        return state
+
+
+class QuizServer:
+    """Session registry plus the HTTP routes over it."""
+
+    def __init__(self, bank):
+        self.bank = bank
+        self.sampler = QuestionSampler(bank)
+        self.sessions = {}
+        self.recent_by_candidate = OrderedDict()
+        self._last_sweep = time.monotonic()
+
+    # -- sessions -------------------------------------------------------------
+
+    def create_session(self, candidate=None, num_questions=DEFAULT_NUM_QUESTIONS,
+                       categories=None, difficulties=None, tags=None):
+        self.expire_sessions()
+
+        engine = QuizEngine(self.bank, sampler=self.sampler, recent=self._recent_for(candidate))
+        engine.start(num_questions, categories=categories, difficulties=difficulties, tags=tags)
+        if not engine.questions:
+            raise HTTPError(409, "no questions match the requested filters")
+
+        session = QuizSession(uuid.uuid4().hex, candidate, engine)
+        self.sessions[session.session_id] = session
+        return session
+
+    def _recent_for(self, candidate):
+        if candidate is None:
+            return RecentQuestions()
+        recent = self.recent_by_candidate.pop(candidate, None)
+        if recent is None:
+            recent = RecentQuestions()
+        self.recent_by_candidate[candidate] = recent
+        while len(self.recent_by_candidate) > MAX_REMEMBERED_CANDIDATES:
+            self.recent_by_candidate.popitem(last=False)
+        return recent
+
+    def get_session(self, session_id):
+        session = self.sessions.get(session_id)
+        if session is None:
+            raise HTTPError(404, "unknown session")
+        session.last_active = time.monotonic()
+        return session
+
+    def expire_sessions(self):
+        now = time.monotonic()
+        if now - self._last_sweep < SESSION_SWEEP_INTERVAL:
+            return
+        self._last_sweep = now
+        cutoff = now - SESSION_IDLE_TIMEOUT
+        expired = [sid for sid, session in self.sessions.items() if session.last_active < cutoff]
+        for session_id in expired:
+            del self.sessions[session_id]
+
+    # -- routing --------------------------------------------------------------
+
+    def handle(self, method, path, body):
+        """Dispatch one request, returning ``(status, payload)``."""
+        parts = [part for part in path.split('?', 1)[0].split('/') if part]
+
+        if parts == ['health']:
+            self._require(method, 'GET')
+            return 200, {'sessions': len(self.sessions), 'questions': len(self.bank)}
+
+        if parts == ['sessions']:
+            self._require(method, 'POST')
+            return 201, self._create(body)
+
+        if len(parts) >= 2 and parts[0] == 'sessions':
+            session = self.get_session(parts[1])
+            action = parts[2] if len(parts) == 3 else None
+            if len(parts) > 3:
+                raise HTTPError(404, "not found")
+
+            if action is None:
+                if method == 'DELETE':
+                    del self.sessions[session.session_id]
+                    return 200, {'deleted': session.session_id}
+                self._require(method, 'GET')
+                return 200, session.state()
+            if action == 'answer':
+                self._require(method, 'POST')
+                return 200, self._answer(session, body)
+            if action == 'skip':
+                self._require(method, 'POST')
+                return 200, self._skip(session)
+            if action == 'results':
+                self._require(method, 'GET')
+                return 200, session.engine.results()
+
+        raise HTTPError(404, "not found")
+
+    @staticmethod
+    def _require(method, expected):
+        if method != expected:
+            raise HTTPError(405, f"use {expected}")
+
+    def _create(self, body):
+        num_questions = body.get('num_questions', DEFAULT_NUM_QUESTIONS)
+        if (not isinstance(num_questions, int) or isinstance(num_questions, bool)
+                or not 1 <= num_questions <= MAX_NUM_QUESTIONS):
+            raise HTTPError(400, f"num_questions must be between 1 and {MAX_NUM_QUESTIONS}")
+        if body.get('candidate') is not None and not isinstance(body['candidate'], str):
+            raise HTTPError(400, "candidate must be a string")
+        for key in ('categories', 'difficulties', 'tags'):
+            value = body.get(key)
+            if value is not None and not (isinstance(value, list) and all(isinstance(item, str) for item in value)):
+                raise HTTPError(400, f"{key} must be a list of strings")
+
+        session = self.create_session(
+            candidate=body.get('candidate'),
+            num_questions=num_questions,
+            categories=body.get('categories'),
+            difficulties=body.get('difficulties'),
+            tags=body.get('tags')
+        )
+        return session.state()
+
+    def _answer(self, session, body):
+        if session.engine.finished:
+            raise HTTPError(409, "quiz is already finished")
+        guess = str(body.get('answer', '')).strip().upper()
+        try:
+            correct, correct_answer = session.engine.answer(guess)
+        except ValueError as e:
+            raise HTTPError(400, str(e))
+        response = session.state()
+        response.update(correct=correct, correct_answer=correct_answer)
+        return response
+
+    def _skip(self, session):
+        if session.engine.finished:
+            raise HTTPError(409, "quiz is already finished")
+        session.engine.skip()
+        return session.state()
+
+    # -- HTTP -----------------------------------------------------------------
+
+    async def handle_connection(self, reader, writer):
+        """Serve HTTP/1.1 requests on one connection, keeping it alive between requests."""
+        try:
+            while True:
+                request_line = await self._read_line(reader, 414, "request line too long")
+                if not request_line:
+                    break
+                keep_alive = await self._serve_request(request_line, reader, writer)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except HTTPError as e:
+            # A line over the stream limit: the rest of the request cannot be framed, so answer and close
+            self._write_response(writer, e.status, {'error': e.message}, False)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _read_line(reader, status, message):
+        try:
+            return await reader.readline()
+        except (ValueError, asyncio.LimitOverrunError):
+            raise HTTPError(status, message)
+
+    async def _serve_request(self, request_line, reader, writer):
+        try:
+            method, path, version = request_line.decode('latin-1').split()
+        except ValueError:
+            self._write_response(writer, 400, {'error': "malformed request line"}, False)
+            return False
+
+        headers = {}
+        for _ in range(MAX_HEADER_LINES):
+            line = await self._read_line(reader, 431, "header line too long")
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        connection = headers.get('connection', '').lower()
+        keep_alive = connection != 'close' if version == 'HTTP/1.1' else connection == 'keep-alive'
+
+        try:
+            length = int(headers.get('content-length', 0))
+        except ValueError:
+            length = -1
+        if length < 0:
+            self._write_response(writer, 400, {'error': "invalid Content-Length"}, False)
+            return False
+
+        try:
+            if length > MAX_BODY_SIZE:
+                raise HTTPError(413, "request body too large")
+            raw_body = await reader.readexactly(length) if length else b''
+            try:
+                body = json.loads(raw_body) if raw_body else {}
+            except ValueError:
+                raise HTTPError(400, "body must be JSON")
+            if not isinstance(body, dict):
+                raise HTTPError(400, "body must be a JSON object")
+            status, payload = self.handle(method.upper(), path, body)
+        except HTTPError as e:
+            status, payload = e.status, {'error': e.message}
+            if e.status == 413:
+                keep_alive = False
+        except Exception:
+            # A bug in one route must not take the connection handler down silently
+            traceback.print_exc()
+            status, payload, keep_alive = 500, {'error': "internal server error"}, False
+
+        self._write_response(writer, status, payload, keep_alive)
+        return keep_alive
+
+    @staticmethod
+    def _write_response(writer, status, payload, keep_alive):
+        body = json.dumps(payload).encode('utf-8')
+        head = (
+            f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode('latin-1') + body)
+
+
+def load_bank():
+    """Load the shared question bank the same way the kiosk does, falling back to defaults."""
+    try:
+        bank, source = load_question_bank()
+        print(f"Loaded {len(bank)} questions ({source})")
+    except Exception as e:
+        print(f"Could not load questions from sheet: {e}\nUsing default questions.")
+        bank = QuestionStore.from_dicts(DEFAULT_QUESTIONS)
+    # Build the lookup structures before the event loop starts serving
+    bank.strata()
+    bank.question_index()
+    return bank
+
+
+async def serve(server, host=DEFAULT_HOST, port=DEFAULT_PORT):
+    listener = await asyncio.start_server(server.handle_connection, host, port)
+    address = listener.sockets[0].getsockname()
+    print(f"Quiz server listening on http://{address[0]}:{address[1]}")
+    async with listener:
+        await listener.serve_forever()
+
+
+def run(host=DEFAULT_HOST, port=DEFAULT_PORT):
+    server = QuizServer(load_bank())
+    try:
+        asyncio.run(serve(server, host, port))
+    except KeyboardInterrupt:
+        pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Brain Buster multi-session quiz server")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args(argv)
+    run(args.host, args.port)
+
+
+if __name__ == "__main__":
+    main()
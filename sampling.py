@@ -0,0 +1,183 @@
+"""Question sampling for the Brain Buster quiz.
+
+The default draw is uniform over the whole bank, exactly like
+``random.sample``. Callers can restrict the draw to categories and
+difficulties, weight strata against each other and exclude questions a
+candidate saw recently. Strata come precomputed from the QuestionStore and
+are chosen with an alias table, so a draw costs O(k) expected time rather
+than a scan of the bank.
+"""
+import random
+from collections import deque
+
+# Rejections tolerated per requested question before falling back to an exhaustive draw
+MAX_REJECTIONS_PER_QUESTION = 20
+
+
+class AliasTable:
+    """Vose's alias method: O(1) draws from a fixed discrete distribution."""
+
+    def __init__(self, weights):
+        count = len(weights)
+        total = float(sum(weights))
+        if count == 0 or total <= 0:
+            raise ValueError("alias table needs at least one positive weight")
+
+        self.probability = [0.0] * count
+        self.alias = [0] * count
+        scaled = [w * count / total for w in weights]
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+            self.probability[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] = scaled[more] + scaled[less] - 1.0
+            if scaled[more] < 1.0:
+                small.append(more)
+            else:
+                large.append(more)
+
+        # Whatever is left is 1.0 up to rounding error
+        for i in large + small:
+            self.probability[i] = 1.0
+
+    def draw(self, rng=random):
+        column = rng.randrange(len(self.probability))
+        if rng.random() < self.probability[column]:
+            return column
+        return self.alias[column]
+
+
+class RecentQuestions:
+    """The last ``capacity`` question indexes a candidate was shown."""
+
+    def __init__(self, capacity=50):
+        self.capacity = capacity
+        self._order = deque()
+        self._seen = set()
+
+    def add(self, indexes):
+        for index in indexes:
+            if index in self._seen:
+                continue
+            self._order.append(index)
+            self._seen.add(index)
+            if len(self._order) > self.capacity:
+                self._seen.discard(self._order.popleft())
+
+    def clear(self):
+        self._order.clear()
+        self._seen.clear()
+
+    def __contains__(self, index):
+        return index in self._seen
+
+    def __len__(self):
+        return len(self._order)
+
+
+class QuestionSampler:
+    """Draws question indexes from a QuestionStore."""
+
+    def __init__(self, store, rng=random):
+        self.store = store
+        self.rng = rng
+
+    def sample(self, num_questions, categories=None, difficulties=None,
+               category_weights=None, difficulty_weights=None, recent=None):
+        """Return up to ``num_questions`` distinct question indexes.
+
+        ``categories`` and ``difficulties`` restrict the draw to those labels.
+        Weight dicts multiply the chance of drawing from a category or
+        difficulty (missing labels weigh 1.0), so equal weights keep every
+        question equally likely. Indexes in ``recent`` are avoided while
+        enough other questions exist, and the drawn ones are added to it.
+        """
+        store = self.store
+        filtered = categories is not None or difficulties is not None
+        weighted = bool(category_weights) or bool(difficulty_weights)
+
+        if not filtered and not weighted and not recent:
+            chosen = self.rng.sample(range(len(store)), min(num_questions, len(store)))
+        else:
+            strata = self._eligible_strata(categories, difficulties, category_weights, difficulty_weights)
+            chosen = self._draw(strata, num_questions, recent)
+
+        if recent is not None:
+            recent.add(chosen)
+        return chosen
+
+    def sample_from(self, candidates, num_questions, recent=None):
+        """Uniformly draw up to ``num_questions`` of ``candidates``, e.g. a QuestionIndex result."""
+        chosen = self._draw([(candidates, 1.0)], num_questions, recent) if len(candidates) else []
+        if recent is not None:
+            recent.add(chosen)
+        return chosen
+
+    def _eligible_strata(self, categories, difficulties, category_weights, difficulty_weights):
+        store = self.store
+        category_codes = self._codes(store.categories, categories)
+        difficulty_codes = self._codes(store.difficulties, difficulties)
+        category_weights = category_weights or {}
+        difficulty_weights = difficulty_weights or {}
+
+        strata = []
+        for (category_code, difficulty_code), members in store.strata().items():
+            if category_codes is not None and category_code not in category_codes:
+                continue
+            if difficulty_codes is not None and difficulty_code not in difficulty_codes:
+                continue
+            weight = (len(members)
+                      * category_weights.get(store.categories.labels[category_code], 1.0)
+                      * difficulty_weights.get(store.difficulties.labels[difficulty_code], 1.0))
+            if weight > 0:
+                strata.append((members, weight))
+        return strata
+
+    @staticmethod
+    def _codes(column, labels):
+        if labels is None:
+            return None
+        return {column.code(label) for label in labels} - {None}
+
+    def _draw(self, strata, num_questions, recent):
+        if not strata:
+            return []
+
+        available = sum(len(members) for members, _ in strata)
+        num_questions = min(num_questions, available)
+        table = AliasTable([weight for _, weight in strata])
+        chosen = []
+        chosen_set = set()
+
+        rejections = 0
+        max_rejections = MAX_REJECTIONS_PER_QUESTION * num_questions
+        while len(chosen) < num_questions and rejections < max_rejections:
+            members = strata[table.draw(self.rng)][0]
+            index = members[self.rng.randrange(len(members))]
+            if index in chosen_set or (recent is not None and index in recent):
+                rejections += 1
+                continue
+            chosen.append(index)
+            chosen_set.add(index)
+
+        if len(chosen) < num_questions:
+            # Nearly everything eligible was excluded: finish with one exhaustive pass,
+            # falling back to recently seen questions only if nothing else is left
+            fresh = []
+            seen = []
+            for members, _ in strata:
+                for index in members:
+                    if index in chosen_set:
+                        continue
+                    (seen if recent is not None and index in recent else fresh).append(index)
+            needed = num_questions - len(chosen)
+            extra = self.rng.sample(fresh, min(needed, len(fresh)))
+            if len(extra) < needed:
+                extra += self.rng.sample(seen, needed - len(extra))
+            chosen.extend(extra)
+
+        return chosen
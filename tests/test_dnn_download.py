@@ -0,0 +1,60 @@
+"""download_dnn_model checks what it downloads against the pinned hashes."""
+import hashlib
+import os
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+import proctoring
+from proctoring import DNN_CONFIG_FILE, DNN_MODEL_FILE, download_dnn_model
+
+FILES = {
+    '/deploy.prototxt': b'name: "stand-in config"\n',
+    '/model.caffemodel': b'stand-in weights' * 100,
+}
+
+
+class ModelHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = FILES[self.path]
+        self.server.requests.append(self.path)
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def model_server(monkeypatch, http_server):
+    server = http_server(ModelHandler)
+    monkeypatch.setattr(proctoring, 'DNN_CONFIG_URL', server.url + '/deploy.prototxt')
+    monkeypatch.setattr(proctoring, 'DNN_MODEL_URL', server.url + '/model.caffemodel')
+    monkeypatch.setattr(proctoring, 'DNN_CONFIG_SHA256', hashlib.sha256(FILES['/deploy.prototxt']).hexdigest())
+    monkeypatch.setattr(proctoring, 'DNN_MODEL_SHA256', hashlib.sha256(FILES['/model.caffemodel']).hexdigest())
+    return server
+
+
+def test_matching_files_are_kept(model_server, tmp_path):
+    download_dnn_model(str(tmp_path))
+    assert (tmp_path / DNN_CONFIG_FILE).read_bytes() == FILES['/deploy.prototxt']
+    assert (tmp_path / DNN_MODEL_FILE).read_bytes() == FILES['/model.caffemodel']
+
+    # Verified files are not fetched again
+    download_dnn_model(str(tmp_path))
+    assert len(model_server.requests) == 2
+
+
+def test_mismatch_is_deleted_and_raises(model_server, tmp_path, monkeypatch):
+    monkeypatch.setattr(proctoring, 'DNN_MODEL_SHA256', '0' * 64)
+    with pytest.raises(ValueError, match="SHA-256"):
+        download_dnn_model(str(tmp_path))
+    assert sorted(os.listdir(tmp_path)) == [DNN_CONFIG_FILE]
+
+
+def test_tampered_file_is_replaced(model_server, tmp_path):
+    (tmp_path / DNN_CONFIG_FILE).write_bytes(b'tampered')
+    download_dnn_model(str(tmp_path))
+    assert (tmp_path / DNN_CONFIG_FILE).read_bytes() == FILES['/deploy.prototxt']
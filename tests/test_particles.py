@@ -0,0 +1,126 @@
+"""Where the celebration effects put their particles."""
+import tkinter as tk
+
+import numpy as np
+import pytest
+
+from animation import AnimationScheduler
+from particles import PARTICLE_TAG, ParticleSystem, confetti, firecracker, fireworks, free_regions
+
+SCREEN = (1600, 900)
+COVERED = (500, 300, 1100, 850)
+# Roughly the quiz screen: clock, title block, question and the camera panel overlapping the exit button
+QUIZ_SCREEN = [
+    (700, 0, 900, 30), (600, 100, 1000, 360), (350, 380, 1250, 850),
+    (1370, 100, 1570, 330), (1500, 20, 1580, 60), (1380, 50, 1560, 80),
+]
+
+
+class StackingCanvas:
+    """Just enough of a Tk canvas to track items and their stacking order."""
+
+    def __init__(self):
+        self.stack = []
+        self.tags = {}
+
+    def create_text(self, x, y, tags=(), **options):
+        item = len(self.tags) + 1
+        self.tags[item] = (tags,) if isinstance(tags, str) else tuple(tags)
+        self.stack.append(item)
+        return item
+
+    def tag_raise(self, tag):
+        raised = [item for item in self.stack if tag in self.tags[item]]
+        self.stack = [item for item in self.stack if tag not in self.tags[item]] + raised
+
+    def coords(self, item, *position):
+        pass
+
+    def itemconfigure(self, item, **options):
+        pass
+
+    def winfo_exists(self):
+        return True
+
+
+@pytest.fixture
+def system():
+    scheduler = AnimationScheduler(tk.Tcl())
+    yield ParticleSystem(StackingCanvas(), scheduler, seed=3)
+    scheduler.stop()
+
+
+def glyphs_overlap(points, boxes, size=40):
+    """Whether the glyph drawn at each point (anchored top-left) reaches into any of ``boxes``."""
+    overlap = np.zeros(len(points), dtype=bool)
+    # Touching a box's edge is fine; allow for rounding in the end positions
+    lo, hi = points + size - 1e-6, points + 1e-6
+    for x0, y0, x1, y1 in boxes:
+        overlap |= (lo[:, 0] > x0) & (hi[:, 0] < x1) & (lo[:, 1] > y0) & (hi[:, 1] < y1)
+    return overlap
+
+
+def endpoints(system):
+    """Start and end positions of the live particles, ignoring gravity and wobble."""
+    live = system.life > 0
+    start = system.position[live]
+    return start, start + system.velocity[live] * system.life[live, None]
+
+
+def area(boxes):
+    return sum((x1 - x0) * (y1 - y0) for x0, y0, x1, y1 in boxes)
+
+
+def test_free_regions_tile_the_rest_of_the_screen():
+    regions = free_regions(*SCREEN, [COVERED])
+    assert area(regions) == SCREEN[0] * SCREEN[1] - area([COVERED])
+    # A box reaching past the screen edges leaves only the margins
+    assert free_regions(*SCREEN, [(-10, -10, 400, 2000)]) == [(400, 0, 1600, 900)]
+
+
+def test_free_regions_around_several_boxes():
+    regions = free_regions(*SCREEN, QUIZ_SCREEN)
+    # Overlapping boxes are only subtracted once
+    covered = np.zeros((SCREEN[1], SCREEN[0]), dtype=bool)
+    for x0, y0, x1, y1 in QUIZ_SCREEN:
+        covered[y0:y1, x0:x1] = True
+    assert area(regions) == covered.size - covered.sum()
+    for x0, y0, x1, y1 in regions:
+        assert not covered[y0:y1, x0:x1].any()
+
+
+@pytest.mark.parametrize('boxes', [[COVERED], QUIZ_SCREEN])
+def test_firecracker_stays_clear_of_the_widgets(system, boxes):
+    assert firecracker(system, *SCREEN, regions=free_regions(*SCREEN, boxes))
+    start, end = endpoints(system)
+    assert not glyphs_overlap(start, boxes).any()
+    assert not glyphs_overlap(end, boxes).any()
+
+
+def test_fireworks_stay_clear_of_the_widgets(system):
+    assert fireworks(system, SCREEN[0], regions=free_regions(*SCREEN, QUIZ_SCREEN))
+    start, end = endpoints(system)
+    assert not glyphs_overlap(start, QUIZ_SCREEN, 25).any()
+    assert not glyphs_overlap(end, QUIZ_SCREEN, 25).any()
+
+
+def test_no_room_means_no_bursts(system):
+    assert firecracker(system, *SCREEN, regions=free_regions(*SCREEN, [(0, 0, 1600, 880)])) == 0
+    assert system.active == 0
+
+
+def test_confetti_lands_before_the_covered_box(system):
+    confetti(system, *SCREEN, regions=free_regions(*SCREEN, [COVERED]))
+    start, end = endpoints(system)
+    assert not glyphs_overlap(start, [COVERED]).any()
+    assert not glyphs_overlap(end, [COVERED]).any()
+    assert np.all(end[:, 1] <= SCREEN[1] + 1e-6)
+
+
+def test_particles_stay_above_items_drawn_later(system):
+    canvas = system.canvas
+    firecracker(system, *SCREEN, bursts=2)
+    cartoon = canvas.create_text(0, 0, text="🙂")
+    confetti(system, *SCREEN, pieces=5)
+    assert canvas.stack.index(cartoon) < min(canvas.stack.index(item) for item in canvas.tags
+                                             if PARTICLE_TAG in canvas.tags[item])
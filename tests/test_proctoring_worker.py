@@ -0,0 +1,71 @@
+"""Start-up and shutdown of the proctoring process."""
+import time
+
+import pytest
+
+import proctoring_worker
+from frame_sources import HEALTH_OFFLINE, HEALTH_OK, HEALTH_STARTING
+from proctoring import ProctoringConfig
+from proctoring_worker import ProctoringWorker, run_worker
+
+
+def wait_for_start(worker, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while worker.starting and time.monotonic() < deadline:
+        worker.isOpened()
+        time.sleep(0.05)
+    return worker.isOpened()
+
+
+@pytest.mark.parametrize('source, opened', [("synthetic:160x120", True), ("/nonexistent/video.avi", False)])
+def test_is_opened_never_blocks(source, opened):
+    worker = ProctoringWorker(ProctoringConfig(source=source, use_process=True))
+    try:
+        started = time.monotonic()
+        first = worker.isOpened()
+        assert time.monotonic() - started < 0.5
+        if worker.starting:
+            assert first is False
+            assert worker.health == HEALTH_STARTING
+        assert wait_for_start(worker) is opened
+        assert not worker.starting
+        assert worker.health == (HEALTH_OK if opened else HEALTH_OFFLINE)
+        if not opened:
+            # The child's reason arrives even though it exits right after sending it
+            assert worker.error == "could not access camera"
+    finally:
+        worker.release()
+
+
+class Results:
+    def __init__(self):
+        self.messages = []
+
+    def cancel_join_thread(self):
+        pass
+
+    def put(self, message):
+        self.messages.append(message)
+
+
+class ClosedSupervisor:
+    instances = []
+
+    def __init__(self, open_source):
+        self.released = False
+        ClosedSupervisor.instances.append(self)
+
+    def isOpened(self):
+        return False
+
+    def release(self):
+        self.released = True
+
+
+def test_failed_open_releases_the_supervisor(monkeypatch):
+    monkeypatch.setattr(proctoring_worker, 'CaptureSupervisor', ClosedSupervisor)
+    monkeypatch.setattr(ClosedSupervisor, 'instances', [])
+    results = Results()
+    run_worker(ProctoringConfig(source="synthetic"), None, (1, 1, 3), results, None)
+    assert results.messages == [('opened', False, "could not access camera")]
+    assert [supervisor.released for supervisor in ClosedSupervisor.instances] == [True]
@@ -0,0 +1,119 @@
+"""load_question_bank against a local HTTP stand-in for the sheet export."""
+from http.server import BaseHTTPRequestHandler
+
+import csv
+
+import pytest
+import requests
+
+from question_bank import QuestionBankCache, load_question_bank, sheet_csv_url
+
+SHEET = (
+    "Question,Option A,Option B,Option C,Option D,Correct Answer\r\n"
+    "How many legs has a spider?,6,8,10,12,B\r\n"
+    "Which planet is red?,Venus,Mars,Jupiter,Saturn,B\r\n"
+)
+ETAG = '"v1"'
+
+
+class SheetHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.requests.append(dict(self.headers))
+        if self.headers.get('If-None-Match') == self.server.etag:
+            self.send_response(304)
+            self.send_header('ETag', self.server.etag)
+            self.end_headers()
+            return
+        body = self.server.sheet.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/csv; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', self.server.etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def sheet_server(http_server):
+    server = http_server(SheetHandler)
+    server.url += "/export.csv"
+    server.sheet = SHEET
+    server.etag = ETAG
+    return server
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return QuestionBankCache(str(tmp_path / "question_bank.json"))
+
+
+def test_download_stores_etag(sheet_server, cache):
+    questions, source = load_question_bank(sheet_server.url, cache=cache)
+
+    assert source == "network"
+    assert len(questions) == 2
+    assert questions[0]['correct_answer'] == "B"
+    assert cache.load(sheet_server.url)['etag'] == ETAG
+
+
+def test_fresh_cache_skips_network(sheet_server, cache):
+    load_question_bank(sheet_server.url, cache=cache)
+    questions, source = load_question_bank(sheet_server.url, cache=cache)
+
+    assert source == "cache"
+    assert len(questions) == 2
+    assert len(sheet_server.requests) == 1
+
+
+def test_old_cache_is_revalidated_with_304(sheet_server, cache):
+    load_question_bank(sheet_server.url, cache=cache)
+    questions, source = load_question_bank(sheet_server.url, cache=cache, max_age=0)
+
+    assert source == "revalidated"
+    assert len(questions) == 2
+    assert sheet_server.requests[-1].get('If-None-Match') == ETAG
+
+
+def test_network_failure_serves_stale_cache(sheet_server, cache):
+    url = sheet_server.url
+    load_question_bank(url, cache=cache)
+    sheet_server.shutdown()
+    sheet_server.server_close()
+
+    questions, source = load_question_bank(url, cache=cache, max_age=0, timeout=2)
+
+    assert source == "stale"
+    assert len(questions) == 2
+
+
+def test_unreadable_sheet_serves_stale_cache(sheet_server, cache):
+    load_question_bank(sheet_server.url, cache=cache)
+    # A field longer than the csv module accepts makes the reader raise csv.Error
+    sheet_server.sheet = SHEET + "Long question," + "x" * (csv.field_size_limit() + 1) + ",b,c,d,A\r\n"
+    sheet_server.etag = '"v2"'
+
+    questions, source = load_question_bank(sheet_server.url, cache=cache, max_age=0)
+
+    assert source == "stale"
+    assert len(questions) == 2
+
+
+def test_network_failure_without_cache_raises(sheet_server, cache):
+    url = sheet_server.url
+    sheet_server.shutdown()
+    sheet_server.server_close()
+
+    with pytest.raises(requests.RequestException):
+        load_question_bank(url, cache=cache, timeout=2)
+
+
+def test_sheet_url_env_is_read_at_call_time(monkeypatch, sheet_server, cache):
+    monkeypatch.setenv("BRAIN_BUSTER_SHEET_URL", sheet_server.url)
+
+    assert sheet_csv_url() == sheet_server.url
+    questions, source = load_question_bank(cache=cache)
+    assert source == "network"
+    assert len(sheet_server.requests) == 1
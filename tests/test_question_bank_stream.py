@@ -0,0 +1,64 @@
+"""Streaming the sheet export into the CSV reader."""
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+from question_bank import QuestionBankCache, load_question_bank, parse_questions
+
+# A quoted option spans two lines with a CRLF, and the next record follows directly
+SHEET = (
+    "﻿Question,Option A,Option B,Option C,Option D,Correct Answer\r\n"
+    "\"Pick the\r\ntwo-line option\",\"first\r\nsecond\",b,c,d,A\r\n"
+    "Plain question,w,x,y,z,D\r\n"
+).encode('utf-8')
+
+
+class ChunkedHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/csv')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        # Chunk boundaries fall between every CR and LF and inside the BOM
+        for start in range(0, len(SHEET), self.server.chunk_size):
+            chunk = SHEET[start:start + self.server.chunk_size]
+            self.wfile.write(f"{len(chunk):x}\r\n".encode('ascii') + chunk + b"\r\n")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(params=[1, 2, 3, 7, 4096])
+def chunked_server(request, http_server):
+    server = http_server(ChunkedHandler)
+    server.chunk_size = request.param
+    return server.url + "/export.csv"
+
+
+def test_quoted_newlines_survive_any_chunking(chunked_server, tmp_path):
+    cache = QuestionBankCache(str(tmp_path / "question_bank.json"))
+    questions, source = load_question_bank(chunked_server, cache=cache)
+
+    assert source == "network"
+    assert len(questions) == 2
+    assert questions.invalid_rows == []
+    assert questions[0]['question'] == "Pick the\r\ntwo-line option"
+    assert questions[0]['options'][0] == "first\r\nsecond"
+    assert questions[1]['correct_answer'] == "D"
+
+
+def test_invalid_rows_are_numbered_as_sheet_rows():
+    text = (
+        "Question,Option A,Option B,Option C,Option D,Correct Answer\r\n"
+        "\"Three\r\nline\r\nquestion\",a,b,c,d,A\r\n"
+        "No answer,a,b,c,d,\r\n"
+        "Plain question,w,x,y,z,D\r\n"
+        "Bad answer,a,b,c,d,E\r\n"
+    )
+    questions = parse_questions(text)
+
+    # Rows 3 and 5 of the spreadsheet, although the CSV lines are 5 and 7
+    assert [sheet_row for sheet_row, reason in questions.invalid_rows] == [3, 5]
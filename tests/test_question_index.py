@@ -0,0 +1,71 @@
+"""Postings of QuestionIndex against a brute-force scan of the store."""
+from question_bank import QuestionStore
+
+QUESTIONS = [
+    ("What is 2 + 2?", ('3', '4', '5', '6'), 1, 'Math', 'Easy', ('arithmetic',)),
+    ("Capital of France?", ('Paris', 'Rome', 'Oslo', 'Bern'), 0, 'Geography', 'Easy', ('europe', 'capitals')),
+    ("Square root of 81?", ('7', '8', '9', '10'), 2, 'Math', 'Hard', ('arithmetic', 'roots')),
+    ("Longest river?", ('Nile', 'Amazon', 'Danube', 'Volga'), 0, 'Geography', 'Hard', ()),
+    ("Capital of Norway?", ('Paris', 'Rome', 'Oslo', 'Bern'), 2, 'Geography', 'Medium', ('capitals', 'europe')),
+    ("7 x 6?", ('36', '42', '48', '54'), 1, 'Math', 'Medium', ('arithmetic',)),
+]
+
+
+def make_store(rows=QUESTIONS):
+    store = QuestionStore()
+    for row in rows:
+        store.append(*row)
+    return store
+
+
+def test_postings_match_a_scan_of_the_store():
+    store = make_store()
+    index = store.question_index()
+    for category in ('Math', 'Geography', 'Missing'):
+        expected = [i for i in range(len(store)) if store.category(i) == category]
+        assert list(index.by_category(category)) == expected
+    for difficulty in ('Easy', 'Medium', 'Hard'):
+        expected = [i for i in range(len(store)) if store.difficulty(i) == difficulty]
+        assert list(index.by_difficulty(difficulty)) == expected
+    for tag in ('arithmetic', 'europe', 'capitals', 'roots', 'missing'):
+        expected = [i for i in range(len(store)) if tag in store.tags(i)]
+        assert list(index.by_tag(tag)) == expected
+    assert list(index.find(categories=['Geography'], tags=['europe'], difficulties=['Medium'])) == [4]
+
+
+def test_store_can_grow_after_indexing():
+    store = make_store()
+    index = store.question_index()
+    assert store.question_index() is index
+    # The index keeps no views into the store's arrays, which would block resizing them
+    store.append("Capital of Italy?", ('Paris', 'Rome', 'Oslo', 'Bern'), 1, 'Geography', 'Easy', ('europe',))
+    assert list(index.by_tag('europe')) == [1, 4]
+    rebuilt = store.question_index()
+    assert rebuilt is not index
+    assert list(rebuilt.by_tag('europe')) == [1, 4, 6]
+
+
+def test_more_categories_than_fit_in_sixteen_bits():
+    store = QuestionStore()
+    count = 70000
+    for number in range(count):
+        store.append(f"Question {number}?", ('a', 'b', 'c', 'd'), 0, category=f"Category {number}")
+    store = QuestionStore.from_state(store.to_state())
+    assert store.category(count - 1) == f"Category {count - 1}"
+    index = store.question_index()
+    assert list(index.by_category(f"Category {count - 1}")) == [count - 1]
+    assert list(index.find(categories=[f"Category {count - 2}"])) == [count - 2]
+
+
+def test_more_tags_than_fit_in_sixteen_bits():
+    store = QuestionStore()
+    count = 70000
+    for number in range(count):
+        store.append(f"Question {number}?", ('a', 'b', 'c', 'd'), 0, tags=(f"tag{number}", 'common'))
+    assert len(store.tag_column.labels) == count + 1
+    # The codes survive the cache round trip
+    store = QuestionStore.from_state(store.to_state())
+    index = store.question_index()
+    assert list(index.by_tag(f"tag{count - 1}")) == [count - 1]
+    assert store.tags(count - 1) == (f"tag{count - 1}", 'common')
+    assert len(index.by_tag('common')) == count
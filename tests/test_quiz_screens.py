@@ -0,0 +1,118 @@
+"""QuizGame screens in a real, withdrawn Tk window; skipped without a display."""
+import time
+import tkinter as tk
+
+import pytest
+
+import quiz
+from particles import PARTICLE_TAG
+from proctoring import ProctoringConfig
+from question_bank import DEFAULT_QUESTIONS, QuestionStore
+from timers import pending_after, pump
+
+
+@pytest.fixture
+def game(monkeypatch):
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        pytest.skip(f"needs a display: {e}")
+    root.withdraw()
+    # Built-in questions instead of the sheet, and no dialogs to block the test
+    monkeypatch.setattr(quiz, 'load_question_bank', lambda **kwargs: (QuestionStore.from_dicts(DEFAULT_QUESTIONS), "network"))
+    for name in ('showwarning', 'showerror', 'showinfo'):
+        monkeypatch.setattr(quiz.messagebox, name, lambda *args, **kwargs: None)
+
+    # No face in the synthetic frames, so never time out on a missing face
+    game = quiz.QuizGame(root, ProctoringConfig(source="synthetic", face_missing_seconds=float("inf")))
+    root.unbind('<FocusOut>')
+    deadline = time.monotonic() + 10
+    while not game.questions and time.monotonic() < deadline:
+        pump(root, 0.05)
+    assert game.questions
+    yield game
+    game.stop_camera()
+    root.destroy()
+
+
+def test_selecting_options_schedules_no_timers(game):
+    root = game.root
+    pump(root, 0.2)
+    pending = pending_after(root)
+    for index in (0, 1, 2, 3, 1, 1):
+        game.select_option(index)
+        pump(root, 0.05)
+        assert game.highlighted_option == "ABCD"[index]
+        # The highlight follows a variable trace; nothing polls for the selection
+        assert pending_after(root) == pending
+
+
+def test_pending_timers_stay_flat_through_a_quiz(game):
+    root = game.root
+    pump(root, 0.2)
+    counts = []
+    while game.question_num < len(game.questions):
+        counts.append(pending_after(root))
+        game.select_option(game.question_num % 4)
+        game.check_answer()
+        pump(root, 1.8)
+    assert max(counts) == counts[0]
+
+
+def test_restarts_leave_no_timers_behind(game):
+    root = game.root
+    counts = []
+    for cycle in range(20):
+        # Leave the next-question timers pending, and on every other cycle the results screen's
+        game.select_option(cycle % 4)
+        game.check_answer()
+        pump(root, 0.02)
+        if cycle % 2:
+            game.show_results()
+            pump(root, 0.02)
+        game.clear_screen()
+        assert len(game.timers) == 0
+        assert not game.animations.animations
+        game.restart_quiz()
+        pump(root, 0.05)
+        counts.append((pending_after(root), len(game.timers)))
+    after_counts, registry_sizes = zip(*counts)
+    assert max(after_counts) <= after_counts[0]
+    assert max(registry_sizes) <= registry_sizes[0]
+
+
+def widget_boxes(game):
+    boxes = []
+    for widget in game.root.place_slaves():
+        if widget is not game.bg_canvas:
+            x, y = widget.winfo_x(), widget.winfo_y()
+            boxes.append((x, y, x + widget.winfo_width(), y + widget.winfo_height()))
+    return boxes
+
+
+def assert_particles_clear_of(particles, boxes, size=40):
+    live = particles.life > 0
+    assert live.any()
+    start = particles.position[live]
+    end = start + particles.velocity[live] * particles.life[live, None]
+    for x0, y0, x1, y1 in boxes:
+        for points in (start, end):
+            # Glyphs are anchored at their top-left corner
+            assert not ((points[:, 0] < x1) & (points[:, 1] < y1)
+                        & (points[:, 0] + size > x0 + 1e-6) & (points[:, 1] + size > y0 + 1e-6)).any()
+
+
+def test_fireworks_are_not_hidden_by_the_quiz_screen(game):
+    pump(game.root, 0.2)
+    game.show_fireworks_animation()
+    assert_particles_clear_of(game.particles, widget_boxes(game), size=25)
+
+
+def test_results_celebration_is_not_hidden_by_the_results(game):
+    game.show_results()
+    assert_particles_clear_of(game.particles, widget_boxes(game))
+
+    # The particles are drawn over the cartoon, which shares their canvas
+    stack = game.bg_canvas.find_all()
+    particle_items = game.bg_canvas.find_withtag(PARTICLE_TAG)
+    assert stack.index(game.cartoon_body) < min(stack.index(item) for item in particle_items)
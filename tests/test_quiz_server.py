@@ -0,0 +1,99 @@
+"""Request validation and error handling of the quiz server."""
+import asyncio
+import json
+
+import pytest
+
+from question_bank import DEFAULT_QUESTIONS, QuestionStore
+from quiz_server import HTTPError, QuizServer
+
+
+@pytest.fixture
+def server():
+    return QuizServer(QuestionStore.from_dicts(DEFAULT_QUESTIONS))
+
+
+@pytest.mark.parametrize('body', [
+    {'candidate': ['x']},
+    {'candidate': 7},
+    {'tags': [1]},
+    {'categories': [['a']]},
+    {'difficulties': 'Easy'},
+    {'num_questions': True},
+])
+def test_create_rejects_malformed_fields(server, body):
+    with pytest.raises(HTTPError) as error:
+        server.handle('POST', '/sessions', body)
+    assert error.value.status == 400
+    assert not server.sessions
+    assert not server.recent_by_candidate
+
+
+def test_create_accepts_string_fields(server):
+    status, state = server.handle('POST', '/sessions', {'candidate': 'alice', 'num_questions': 1, 'tags': []})
+    assert status == 201
+    assert state['candidate'] == 'alice'
+
+
+async def exchange(server, request):
+    listener = await asyncio.start_server(server.handle_connection, '127.0.0.1', 0)
+    port = listener.sockets[0].getsockname()[1]
+    async with listener:
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(request)
+        await writer.drain()
+        response = await asyncio.wait_for(reader.read(), timeout=5)
+        writer.close()
+    return response
+
+
+def post(path, body, connection='close'):
+    data = json.dumps(body).encode('utf-8')
+    head = f"POST {path} HTTP/1.1\r\nConnection: {connection}\r\nContent-Length: {len(data)}\r\n\r\n"
+    return head.encode('latin-1') + data
+
+
+def test_malformed_field_is_a_400_over_http(server):
+    response = asyncio.run(exchange(server, post('/sessions', {'categories': [['a']]}, 'keep-alive') + post('/sessions', {})))
+    # The connection stays usable after a rejected request
+    assert response.startswith(b"HTTP/1.1 400 ")
+    assert b"HTTP/1.1 201 " in response
+    assert response.count(b"HTTP/1.1 ") == 2
+
+
+def test_unexpected_error_returns_500_and_closes(server, monkeypatch):
+    def broken(method, path, body):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(server, 'handle', broken)
+    response = asyncio.run(exchange(server, post('/sessions', {}, 'keep-alive') + post('/sessions', {})))
+    assert response.startswith(b"HTTP/1.1 500 Internal Server Error\r\n")
+    assert b"Connection: close" in response
+    assert response.count(b"HTTP/1.1 ") == 1
+
+
+def test_value_error_in_a_route_is_a_500(server, monkeypatch):
+    def broken(method, path, body):
+        raise ValueError("bug in a route")
+
+    monkeypatch.setattr(server, 'handle', broken)
+    response = asyncio.run(exchange(server, post('/sessions', {})))
+    assert response.startswith(b"HTTP/1.1 500 ")
+
+
+@pytest.mark.parametrize('length', [b"-5", b"abc"])
+def test_invalid_content_length_is_a_400(server, length):
+    request = b"POST /sessions HTTP/1.1\r\nContent-Length: " + length + b"\r\n\r\n{}"
+    response = asyncio.run(exchange(server, request))
+    assert response.startswith(b"HTTP/1.1 400 ")
+    assert b"invalid Content-Length" in response
+
+
+@pytest.mark.parametrize('request_bytes, status', [
+    (b"GET /" + b"a" * 70000 + b" HTTP/1.1\r\n\r\n", b"414"),
+    (b"GET /health HTTP/1.1\r\nX-Long: " + b"a" * 70000 + b"\r\n\r\n", b"431"),
+])
+def test_overlong_lines_are_answered(server, request_bytes, status):
+    response = asyncio.run(exchange(server, request_bytes))
+    assert response.startswith(b"HTTP/1.1 " + status + b" ")
+    assert b"Connection: close" in response
@@ -0,0 +1,49 @@
+"""TimerRegistry and AnimationScheduler leave no ``after`` callbacks behind."""
+import tkinter as tk
+
+import pytest
+
+from animation import AnimationScheduler
+from timers import TimerRegistry, pending_after, pump
+
+
+@pytest.fixture
+def root():
+    # A Tcl interpreter runs the after queue without needing a display
+    return tk.Tcl()
+
+
+def test_callbacks_leave_the_registry_when_they_run(root):
+    timers = TimerRegistry(root)
+    calls = []
+    timers.after(0, calls.append, 'ran')
+    kept = timers.after(60000, calls.append, 'never')
+    assert len(timers) == 2
+    pump(root, 0)
+    assert calls == ['ran']
+    assert len(timers) == 1
+    timers.cancel(kept)
+    assert len(timers) == 0
+    assert pending_after(root) == 0
+
+
+def test_screen_changes_do_not_accumulate_timers(root):
+    timers = TimerRegistry(root)
+    animations = AnimationScheduler(root)
+    baseline = pending_after(root)
+
+    def tick():
+        # Reschedules itself forever, like the clock and the camera preview
+        timers.after(10, tick)
+
+    for screen in range(50):
+        # What a screen leaves behind: a repeating chain, a delayed step and an animation
+        tick()
+        timers.after(1500, lambda: None)
+        animations.add('emoji', lambda now: True)
+        pump(root, 0)
+        # clear_screen
+        assert timers.cancel_all() == 2
+        animations.stop()
+        assert len(timers) == 0
+        assert pending_after(root) == baseline
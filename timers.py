@@ -0,0 +1,72 @@
+"""Lifetime tracking for Tk ``after`` callbacks.
+
+The quiz screens schedule their repeating updates (clock, camera preview)
+and delayed steps (next question, clearing an effect) through a
+``TimerRegistry`` instead of calling ``root.after`` directly. Every callback
+is recorded until it runs or is cancelled, so a screen transition can
+cancel whatever the old screen left behind with ``cancel_all`` instead of
+letting chains that point at destroyed widgets keep rescheduling themselves
+across restarts. A registry must only be used from the Tk thread; worker
+threads keep handing work over with ``root.after(0, ...)``.
+"""
+import time
+from tkinter import TclError
+
+
+def pending_after(root):
+    """How many ``after`` callbacks Tcl holds for ``root``, registered or not."""
+    return len(root.tk.splitlist(root.tk.call('after', 'info')))
+
+
+def pump(root, seconds):
+    """Run the event loop for ``seconds``, at least one ``update`` pass."""
+    deadline = time.monotonic() + seconds
+    while True:
+        root.update()
+        if time.monotonic() >= deadline:
+            return
+        time.sleep(0.005)
+
+
+class TimerRegistry:
+    """The pending ``after`` callbacks of one Tk root."""
+
+    def __init__(self, root):
+        self.root = root
+        self._pending = set()
+        self.scheduled = 0
+        self.cancelled = 0
+
+    def __len__(self):
+        return len(self._pending)
+
+    def after(self, ms, callback, *args):
+        """Like ``root.after``; returns an id for ``cancel``."""
+        def run():
+            self._pending.discard(timer_id)
+            callback(*args)
+
+        timer_id = self.root.after(ms, run)
+        self._pending.add(timer_id)
+        self.scheduled += 1
+        return timer_id
+
+    def cancel(self, timer_id):
+        if timer_id in self._pending:
+            self._pending.discard(timer_id)
+            self._cancel(timer_id)
+
+    def cancel_all(self):
+        """Cancel every pending callback; returns how many there were."""
+        pending = list(self._pending)
+        self._pending.clear()
+        for timer_id in pending:
+            self._cancel(timer_id)
+        return len(pending)
+
+    def _cancel(self, timer_id):
+        try:
+            self.root.after_cancel(timer_id)
+        except TclError:
+            pass
+        self.cancelled += 1